@@ -0,0 +1,76 @@
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast.losses.pytorch import MAE
+from neuralforecast.models import LSTM, NHITS, TSMixer
+from neuralforecast.tsdataset import TimeSeriesDataset
+from neuralforecast.utils import generate_series
+
+warnings.filterwarnings("ignore")
+logging.getLogger("pytorch_lightning").setLevel(logging.ERROR)
+logging.getLogger("lightning.pytorch").setLevel(logging.ERROR)
+
+
+def make_models(h, input_size, n_series):
+    kwargs = dict(
+        h=h,
+        input_size=input_size,
+        max_steps=1,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    # a loss instance per model, the losses store the horizon weights
+    return {
+        "NHITS": NHITS(loss=MAE(), **kwargs),
+        "LSTM": LSTM(loss=MAE(), **kwargs),
+        "TSMixer": TSMixer(n_series=n_series, loss=MAE(), **kwargs),
+    }
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_series", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--h", type=int, default=12)
+    parser.add_argument("--input_size", type=int, default=24)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    results = []
+    for n_series in args.n_series:
+        df = generate_series(n_series, min_length=100, max_length=100, seed=0)
+        dataset, *_ = TimeSeriesDataset.from_df(df)
+        for name, model in make_models(args.h, args.input_size, n_series).items():
+            model.fit(dataset)
+            fcsts, times = {}, {}
+            for engine in ["lightning", "torch"]:
+                model.inference_engine = engine
+                fcsts[engine] = model.predict(dataset)
+                times[engine] = timeit(lambda: model.predict(dataset), args.repeats)
+            np.testing.assert_array_equal(fcsts["lightning"], fcsts["torch"])
+            results.append(
+                {
+                    "n_series": n_series,
+                    "model": name,
+                    "lightning": times["lightning"],
+                    "torch": times["torch"],
+                }
+            )
+    results = pd.DataFrame(results).set_index(["n_series", "model"])
+    results["speedup"] = results["lightning"] / results["torch"]
+    print("Seconds per predict call (best of {} runs)".format(args.repeats))
+    print(results.round(4).to_string())
@@ -0,0 +1,97 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+from neuralforecast.tsdataset import TimeSeriesDataset, TimeSeriesLoader
+
+
+def loop_append(dataset, futr_dataset):
+    # Reference implementation: one slice copy per serie
+    new_indptr = dataset.indptr + futr_dataset.indptr
+    new_temporal = torch.empty(
+        size=(new_indptr[-1], dataset.temporal.shape[1]), dtype=dataset.temporal.dtype
+    )
+    for i in range(dataset.n_groups):
+        curr_size = dataset.indptr[i + 1] - dataset.indptr[i]
+        new_temporal[new_indptr[i] : new_indptr[i] + curr_size] = dataset.temporal[
+            dataset.indptr[i] : dataset.indptr[i + 1]
+        ]
+        new_temporal[new_indptr[i] + curr_size : new_indptr[i + 1]] = (
+            futr_dataset.temporal[futr_dataset.indptr[i] : futr_dataset.indptr[i + 1]]
+        )
+    return new_temporal
+
+
+def loop_trim(dataset, left_trim, right_trim):
+    # Reference implementation: one slice copy per serie
+    return torch.cat(
+        [
+            dataset.temporal[
+                dataset.indptr[i] + left_trim : dataset.indptr[i + 1] - right_trim
+            ]
+            for i in range(dataset.n_groups)
+        ]
+    )
+
+
+def loop_batch(dataset, idxs):
+    # Reference implementation: one padded item per serie, stacked by the collate
+    loader = TimeSeriesLoader(dataset)
+    return loader.collate_fn([dataset[i] for i in idxs])
+
+
+def make_dataset(n_groups, sizes, n_cols=3):
+    indptr = np.append(0, sizes.cumsum()).astype(np.int32)
+    return TimeSeriesDataset(
+        temporal=torch.rand(indptr[-1], n_cols),
+        temporal_cols=[f"col_{i}" for i in range(n_cols - 1)] + ["available_mask"],
+        indptr=indptr,
+        max_size=sizes.max(),
+        min_size=sizes.min(),
+        y_idx=0,
+    )
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_groups", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--h", type=int, default=12)
+    parser.add_argument("--batch_size", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = []
+    for n_groups in args.n_groups:
+        sizes = rng.integers(50, 150, size=n_groups)
+        dataset = make_dataset(n_groups, sizes)
+        futr_dataset = make_dataset(n_groups, np.full(n_groups, args.h))
+        idxs = rng.permutation(n_groups)[: args.batch_size].tolist()
+        results.append(
+            {
+                "n_groups": n_groups,
+                "append_loop": timeit(lambda: loop_append(dataset, futr_dataset), args.repeats),
+                "append": timeit(lambda: dataset.append(futr_dataset), args.repeats),
+                "trim_loop": timeit(lambda: loop_trim(dataset, 10, args.h), args.repeats),
+                "trim": timeit(
+                    lambda: TimeSeriesDataset.trim_dataset(dataset, 10, args.h), args.repeats
+                ),
+                "batch_loop": timeit(lambda: loop_batch(dataset, idxs), args.repeats),
+                "batch": timeit(lambda: dataset.__getitems__(idxs), args.repeats),
+            }
+        )
+    results = pd.DataFrame(results).set_index("n_groups")
+    print("Seconds (best of {} runs)".format(args.repeats))
+    print(results.round(4).to_string())
@@ -147,28 +147,64 @@ d = { 'settings': { 'branch': 'main',
             'neuralforecast.core': { 'neuralforecast.core.NeuralForecast': ('core.html#neuralforecast', 'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.__init__': ( 'core.html#neuralforecast.__init__',
                                                                                       'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._arrays_exog_cols': ( 'core.html#neuralforecast._arrays_exog_cols',
+                                                                                               'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._check_futr_exog': ( 'core.html#neuralforecast._check_futr_exog',
+                                                                                              'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._check_nan': ( 'core.html#neuralforecast._check_nan',
                                                                                         'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._forecast_keys': ( 'core.html#neuralforecast._forecast_keys',
+                                                                                            'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._get_model_names': ( 'core.html#neuralforecast._get_model_names',
                                                                                               'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._get_needed_exog': ( 'core.html#neuralforecast._get_needed_exog',
+                                                                                              'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._get_needed_futr_exog': ( 'core.html#neuralforecast._get_needed_futr_exog',
                                                                                                    'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._ids_positions': ( 'core.html#neuralforecast._ids_positions',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._inference_lookback': ( 'core.html#neuralforecast._inference_lookback',
+                                                                                                 'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._no_refit_cross_validation': ( 'core.html#neuralforecast._no_refit_cross_validation',
                                                                                                         'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_cached': ( 'core.html#neuralforecast._predict_cached',
+                                                                                             'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._predict_distributed': ( 'core.html#neuralforecast._predict_distributed',
                                                                                                   'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_future': ( 'core.html#neuralforecast._predict_future',
+                                                                                             'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_local': ( 'core.html#neuralforecast._predict_local',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_models': ( 'core.html#neuralforecast._predict_models',
+                                                                                             'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_scaled': ( 'core.html#neuralforecast._predict_scaled',
+                                                                                             'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._prepare_fit': ( 'core.html#neuralforecast._prepare_fit',
                                                                                           'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._prepare_fit_dataset': ( 'core.html#neuralforecast._prepare_fit_dataset',
+                                                                                                  'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._prepare_fit_distributed': ( 'core.html#neuralforecast._prepare_fit_distributed',
                                                                                                       'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._reset_models': ( 'core.html#neuralforecast._reset_models',
                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._reset_updates': ( 'core.html#neuralforecast._reset_updates',
+                                                                                            'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_fit_transform': ( 'core.html#neuralforecast._scalers_fit_transform',
                                                                                                     'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_target_inverse_transform': ( 'core.html#neuralforecast._scalers_target_inverse_transform',
                                                                                                                'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_transform': ( 'core.html#neuralforecast._scalers_transform',
                                                                                                 'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._select_scaler': ( 'core.html#neuralforecast._select_scaler',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._stored_last_dates': ( 'core.html#neuralforecast._stored_last_dates',
+                                                                                                'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._stored_series': ( 'core.html#neuralforecast._stored_series',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._uid_positions': ( 'core.html#neuralforecast._uid_positions',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.clear_predict_cache': ( 'core.html#neuralforecast.clear_predict_cache',
+                                                                                                 'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.cross_validation': ( 'core.html#neuralforecast.cross_validation',
                                                                                               'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.fit': ('core.html#neuralforecast.fit', 'neuralforecast/core.py'),
@@ -179,11 +215,29 @@ d = { 'settings': { 'branch': 'main',
                                                                                                    'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.predict': ( 'core.html#neuralforecast.predict',
                                                                                      'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.predict_arrays': ( 'core.html#neuralforecast.predict_arrays',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.predict_cache_info': ( 'core.html#neuralforecast.predict_cache_info',
+                                                                                                'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.predict_insample': ( 'core.html#neuralforecast.predict_insample',
                                                                                               'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.save': ('core.html#neuralforecast.save', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.update': ( 'core.html#neuralforecast.update',
+                                                                                    'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache': ('core.html#_forecastcache', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache.__init__': ( 'core.html#_forecastcache.__init__',
+                                                                                      'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache.__len__': ( 'core.html#_forecastcache.__len__',
+                                                                                     'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache.clear': ( 'core.html#_forecastcache.clear',
+                                                                                   'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache.get': ('core.html#_forecastcache.get', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache.info': ('core.html#_forecastcache.info', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._ForecastCache.put': ('core.html#_forecastcache.put', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._exog_tensor': ('core.html#_exog_tensor', 'neuralforecast/core.py'),
                                      'neuralforecast.core._id_as_idx': ('core.html#_id_as_idx', 'neuralforecast/core.py'),
                                      'neuralforecast.core._insample_times': ('core.html#_insample_times', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._tail_by_id': ('core.html#_tail_by_id', 'neuralforecast/core.py'),
                                      'neuralforecast.core._warn_id_as_idx': ('core.html#_warn_id_as_idx', 'neuralforecast/core.py')},
             'neuralforecast.losses.numpy': { 'neuralforecast.losses.numpy._divide_no_nan': ( 'losses.numpy.html#_divide_no_nan',
                                                                                              'neuralforecast/losses/numpy.py'),
@@ -1307,10 +1361,62 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                                     'neuralforecast/models/vanillatransformer.py'),
                                                           'neuralforecast.models.vanillatransformer.VanillaTransformer.forward': ( 'models.vanillatransformer.html#vanillatransformer.forward',
                                                                                                                                    'neuralforecast/models/vanillatransformer.py')},
-            'neuralforecast.tsdataset': { 'neuralforecast.tsdataset.TimeSeriesDataModule': ( 'tsdataset.html#timeseriesdatamodule',
+            'neuralforecast.serving': { 'neuralforecast.serving.ForecastServer': ( 'serving.html#forecastserver',
+                                                                                   'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__aenter__': ( 'serving.html#forecastserver.__aenter__',
+                                                                                              'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__aexit__': ( 'serving.html#forecastserver.__aexit__',
+                                                                                             'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__init__': ( 'serving.html#forecastserver.__init__',
+                                                                                            'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._predict_batch': ( 'serving.html#forecastserver._predict_batch',
+                                                                                                  'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._predict_requests': ( 'serving.html#forecastserver._predict_requests',
+                                                                                                     'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._serve': ( 'serving.html#forecastserver._serve',
+                                                                                          'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.load': ( 'serving.html#forecastserver.load',
+                                                                                        'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.metrics': ( 'serving.html#forecastserver.metrics',
+                                                                                           'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.predict': ( 'serving.html#forecastserver.predict',
+                                                                                           'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.queue_depth': ( 'serving.html#forecastserver.queue_depth',
+                                                                                               'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.running': ( 'serving.html#forecastserver.running',
+                                                                                           'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.start': ( 'serving.html#forecastserver.start',
+                                                                                         'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.stop': ( 'serving.html#forecastserver.stop',
+                                                                                        'neuralforecast/serving.py')},
+            'neuralforecast.tsdataset': { 'neuralforecast.tsdataset.ParquetTimeSeriesDataset': ( 'tsdataset.html#parquettimeseriesdataset',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset.__init__': ( 'tsdataset.html#parquettimeseriesdataset.__init__',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset.__iter__': ( 'tsdataset.html#parquettimeseriesdataset.__iter__',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset.__repr__': ( 'tsdataset.html#parquettimeseriesdataset.__repr__',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset._collate': ( 'tsdataset.html#parquettimeseriesdataset._collate',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset._iter_series': ( 'tsdataset.html#parquettimeseriesdataset._iter_series',
+                                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset._read_columns': ( 'tsdataset.html#parquettimeseriesdataset._read_columns',
+                                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset._shuffled': ( 'tsdataset.html#parquettimeseriesdataset._shuffled',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset._to_series': ( 'tsdataset.html#parquettimeseriesdataset._to_series',
+                                                                                                            'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.ParquetTimeSeriesDataset._with_batches': ( 'tsdataset.html#parquettimeseriesdataset._with_batches',
+                                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataModule': ( 'tsdataset.html#timeseriesdatamodule',
                                                                                              'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.__init__': ( 'tsdataset.html#timeseriesdatamodule.__init__',
                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataModule._batched_dataset': ( 'tsdataset.html#timeseriesdatamodule._batched_dataset',
+                                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataModule._streaming_loader': ( 'tsdataset.html#timeseriesdatamodule._streaming_loader',
+                                                                                                               'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.predict_dataloader': ( 'tsdataset.html#timeseriesdatamodule.predict_dataloader',
                                                                                                                 'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.train_dataloader': ( 'tsdataset.html#timeseriesdatamodule.train_dataloader',
@@ -1323,13 +1429,31 @@ d = { 'settings': { 'branch': 'main',
                                                                                                  'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__getitem__': ( 'tsdataset.html#timeseriesdataset.__getitem__',
                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__getitems__': ( 'tsdataset.html#timeseriesdataset.__getitems__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__getstate__': ( 'tsdataset.html#timeseriesdataset.__getstate__',
+                                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__init__': ( 'tsdataset.html#timeseriesdataset.__init__',
                                                                                                    'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__len__': ( 'tsdataset.html#timeseriesdataset.__len__',
                                                                                                   'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__repr__': ( 'tsdataset.html#timeseriesdataset.__repr__',
                                                                                                    'neuralforecast/tsdataset.py'),
-                                          'neuralforecast.tsdataset.TimeSeriesDataset._as_torch_copy': ( 'tsdataset.html#timeseriesdataset._as_torch_copy',
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__setstate__': ( 'tsdataset.html#timeseriesdataset.__setstate__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._as_torch': ( 'tsdataset.html#timeseriesdataset._as_torch',
+                                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._gather': ( 'tsdataset.html#timeseriesdataset._gather',
+                                                                                                  'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._set_shared': ( 'tsdataset.html#timeseriesdataset._set_shared',
+                                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._set_temporal_column': ( 'tsdataset.html#timeseriesdataset._set_temporal_column',
+                                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._take_rows': ( 'tsdataset.html#timeseriesdataset._take_rows',
+                                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._temporal_column': ( 'tsdataset.html#timeseriesdataset._temporal_column',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._writable_copy': ( 'tsdataset.html#timeseriesdataset._writable_copy',
                                                                                                          'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.align': ( 'tsdataset.html#timeseriesdataset.align',
                                                                                                 'neuralforecast/tsdataset.py'),
@@ -1337,6 +1461,16 @@ d = { 'settings': { 'branch': 'main',
                                                                                                  'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.from_df': ( 'tsdataset.html#timeseriesdataset.from_df',
                                                                                                   'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.load': ( 'tsdataset.html#timeseriesdataset.load',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.save': ( 'tsdataset.html#timeseriesdataset.save',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.select': ( 'tsdataset.html#timeseriesdataset.select',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.share_memory': ( 'tsdataset.html#timeseriesdataset.share_memory',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.tail': ( 'tsdataset.html#timeseriesdataset.tail',
+                                                                                               'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.trim_dataset': ( 'tsdataset.html#timeseriesdataset.trim_dataset',
                                                                                                        'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.update_dataset': ( 'tsdataset.html#timeseriesdataset.update_dataset',
@@ -1347,6 +1481,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                                   'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesLoader._collate_fn': ( 'tsdataset.html#timeseriesloader._collate_fn',
                                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchBuffers': ( 'tsdataset.html#_batchbuffers',
+                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchBuffers.__init__': ( 'tsdataset.html#_batchbuffers.__init__',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchBuffers.get': ( 'tsdataset.html#_batchbuffers.get',
+                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchedDataset': ( 'tsdataset.html#_batcheddataset',
+                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchedDataset.__getitem__': ( 'tsdataset.html#_batcheddataset.__getitem__',
+                                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchedDataset.__getitems__': ( 'tsdataset.html#_batcheddataset.__getitems__',
+                                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchedDataset.__init__': ( 'tsdataset.html#_batcheddataset.__init__',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchedDataset.__len__': ( 'tsdataset.html#_batcheddataset.__len__',
+                                                                                                'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset._DistributedTimeSeriesDataModule': ( 'tsdataset.html#_distributedtimeseriesdatamodule',
                                                                                                          'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset._DistributedTimeSeriesDataModule.__init__': ( 'tsdataset.html#_distributedtimeseriesdatamodule.__init__',
@@ -1356,7 +1506,87 @@ d = { 'settings': { 'branch': 'main',
                                           'neuralforecast.tsdataset._FilesDataset': ( 'tsdataset.html#_filesdataset',
                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset._FilesDataset.__init__': ( 'tsdataset.html#_filesdataset.__init__',
-                                                                                               'neuralforecast/tsdataset.py')},
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._HistoryBuffer': ( 'tsdataset.html#_historybuffer',
+                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._HistoryBuffer.__init__': ( 'tsdataset.html#_historybuffer.__init__',
+                                                                                                'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._HistoryBuffer._gather': ( 'tsdataset.html#_historybuffer._gather',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._HistoryBuffer._move': ( 'tsdataset.html#_historybuffer._move',
+                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._HistoryBuffer.append': ( 'tsdataset.html#_historybuffer.append',
+                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler': ( 'tsdataset.html#_lengthbucketbatchsampler',
+                                                                                                  'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler.__init__': ( 'tsdataset.html#_lengthbucketbatchsampler.__init__',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler.__iter__': ( 'tsdataset.html#_lengthbucketbatchsampler.__iter__',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler.__len__': ( 'tsdataset.html#_lengthbucketbatchsampler.__len__',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler._update_padding_stats': ( 'tsdataset.html#_lengthbucketbatchsampler._update_padding_stats',
+                                                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesBuffer': ( 'tsdataset.html#_seriesbuffer',
+                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesBuffer.__init__': ( 'tsdataset.html#_seriesbuffer.__init__',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesBuffer._gather': ( 'tsdataset.html#_seriesbuffer._gather',
+                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesBuffer.append': ( 'tsdataset.html#_seriesbuffer.append',
+                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesBuffer.to_dataset': ( 'tsdataset.html#_seriesbuffer.to_dataset',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TailBuffer': ( 'tsdataset.html#_tailbuffer',
+                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TailBuffer.__init__': ( 'tsdataset.html#_tailbuffer.__init__',
+                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TailBuffer._gather': ( 'tsdataset.html#_tailbuffer._gather',
+                                                                                            'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TailBuffer._positions': ( 'tsdataset.html#_tailbuffer._positions',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TailBuffer.append': ( 'tsdataset.html#_tailbuffer.append',
+                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TailBuffer.capacity': ( 'tsdataset.html#_tailbuffer.capacity',
+                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TemporalLayout': ( 'tsdataset.html#_temporallayout',
+                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TemporalLayout.__init__': ( 'tsdataset.html#_temporallayout.__init__',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TemporalLayout.column': ( 'tsdataset.html#_temporallayout.column',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TemporalLayout.decode': ( 'tsdataset.html#_temporallayout.decode',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TemporalLayout.empty': ( 'tsdataset.html#_temporallayout.empty',
+                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._TemporalLayout.set_column': ( 'tsdataset.html#_temporallayout.set_column',
+                                                                                                   'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._WindowsDataset': ( 'tsdataset.html#_windowsdataset',
+                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._WindowsDataset.__getitem__': ( 'tsdataset.html#_windowsdataset.__getitem__',
+                                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._WindowsDataset.__getitems__': ( 'tsdataset.html#_windowsdataset.__getitems__',
+                                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._WindowsDataset.__init__': ( 'tsdataset.html#_windowsdataset.__init__',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._WindowsDataset.__len__': ( 'tsdataset.html#_windowsdataset.__len__',
+                                                                                                'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._WindowsDataset._mask_sum': ( 'tsdataset.html#_windowsdataset._mask_sum',
+                                                                                                  'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._attach_shared_memory': ( 'tsdataset.html#_attach_shared_memory',
+                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._column_from_arrow': ( 'tsdataset.html#_column_from_arrow',
+                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._column_to_arrow': ( 'tsdataset.html#_column_to_arrow',
+                                                                                         'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._column_to_numpy': ( 'tsdataset.html#_column_to_numpy',
+                                                                                         'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._column_type': ( 'tsdataset.html#_column_type',
+                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._ranges_idxs': ( 'tsdataset.html#_ranges_idxs',
+                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._unlink_shared_memory': ( 'tsdataset.html#_unlink_shared_memory',
+                                                                                              'neuralforecast/tsdataset.py')},
             'neuralforecast.utils': { 'neuralforecast.utils.DayOfMonth': ('utils.html#dayofmonth', 'neuralforecast/utils.py'),
                                       'neuralforecast.utils.DayOfMonth.__call__': ( 'utils.html#dayofmonth.__call__',
                                                                                     'neuralforecast/utils.py'),
@@ -19,11 +19,14 @@ import pytorch_lightning as pl
 from pytorch_lightning.callbacks.early_stopping import EarlyStopping
 
 from neuralforecast.tsdataset import (
+    ParquetTimeSeriesDataset,
     TimeSeriesDataModule,
     TimeSeriesDataset,
     _DistributedTimeSeriesDataModule,
+    _LengthBucketBatchSampler,
 )
 from ..losses.pytorch import IQLoss
+from ..utils import get_indexer_raise_missing
 
 # %% ../../nbs/common.base_model.ipynb 3
 @dataclass
@@ -63,6 +66,67 @@ def _disable_torch_init():
         nn.init.xavier_normal_ = xavier_normal
 
 # %% ../../nbs/common.base_model.ipynb 5
+class _ColumnPlan:
+    """Column indices used by the training and inference steps.
+
+    Resolving column names against `temporal_cols` and `static_cols` is done
+    once per dataset layout instead of on every step, the steps then only
+    index tensors. Index tensors are cached per device.
+    """
+
+    def __init__(
+        self,
+        temporal_cols,
+        static_cols,
+        y_idx,
+        temporal_data_cols,
+        hist_exog_list,
+        futr_exog_list,
+        stat_exog_list,
+    ):
+        self.temporal_cols = temporal_cols
+        self.static_cols = static_cols
+        self.y_idx = y_idx
+        self.mask_idx = temporal_cols.get_loc("available_mask")
+        self._idxs = {
+            # target first, then the exogenous normalized along with it
+            "data": np.append(
+                y_idx, get_indexer_raise_missing(temporal_cols, temporal_data_cols)
+            ),
+            "hist": get_indexer_raise_missing(temporal_cols, hist_exog_list),
+            "futr": get_indexer_raise_missing(temporal_cols, futr_exog_list),
+            "stat": (
+                get_indexer_raise_missing(static_cols, stat_exog_list)
+                if len(stat_exog_list)
+                else []
+            ),
+        }
+        self._device_idxs = {}
+
+    def matches(self, temporal_cols, static_cols, y_idx):
+        def _same(cached, cols):
+            if cached is cols:
+                return True
+            if cached is None or cols is None:
+                return False
+            return cached.equals(cols)
+
+        return (
+            self.y_idx == y_idx
+            and _same(self.temporal_cols, temporal_cols)
+            and _same(self.static_cols, static_cols)
+        )
+
+    def idxs(self, name, device):
+        """LongTensor with the `name` ('data', 'hist', 'futr' or 'stat') indices on `device`."""
+        key = (name, device)
+        if key not in self._device_idxs:
+            self._device_idxs[key] = torch.tensor(
+                self._idxs[name], dtype=torch.long, device=device
+            )
+        return self._device_idxs[key]
+
+# %% ../../nbs/common.base_model.ipynb 6
 class BaseModel(pl.LightningModule):
     EXOGENOUS_FUTR = True
     EXOGENOUS_HIST = True
@@ -82,6 +146,9 @@ class BaseModel(pl.LightningModule):
         stat_exog_list,
         max_steps,
         early_stop_patience_steps,
+        bucket_by_length=False,
+        pin_memory_loader=False,
+        inference_engine="lightning",
         **trainer_kwargs,
     ):
         super().__init__()
@@ -155,6 +222,19 @@ class BaseModel(pl.LightningModule):
         if isinstance(self.valid_loss, IQLoss) and not isinstance(self.loss, IQLoss):
             raise Exception("Please set loss to IQLoss() when validating with IQLoss")
 
+        # Batch series of similar lengths during training
+        self.bucket_by_length = bucket_by_length
+        # Gather batches into reusable pinned buffers
+        self.pin_memory_loader = pin_memory_loader
+        # Run `predict_step` through PL's Trainer or a plain torch loop
+        if inference_engine not in ("lightning", "torch"):
+            raise ValueError(
+                f"inference_engine must be 'lightning' or 'torch', got {inference_engine}"
+            )
+        self.inference_engine = inference_engine
+        # Column indices resolved against the dataset, see `_column_plan`
+        self._cached_column_plan = None
+
         ## Trainer arguments ##
         # Max steps, validation steps and check_val_every_n_epoch
         trainer_kwargs = {**trainer_kwargs, "max_steps": max_steps}
@@ -217,9 +297,24 @@ class BaseModel(pl.LightningModule):
         torch.manual_seed(random_seed)
 
     def _get_temporal_exogenous_cols(self, temporal_cols):
-        return list(
-            set(temporal_cols.tolist()) & set(self.hist_exog_list + self.futr_exog_list)
-        )
+        exog_cols = set(self.hist_exog_list + self.futr_exog_list)
+        return [col for col in temporal_cols if col in exog_cols]
+
+    def _column_plan(self, temporal_cols, static_cols, y_idx):
+        # Reuse the resolved indices while the dataset layout doesn't change
+        plan = self._cached_column_plan
+        if plan is None or not plan.matches(temporal_cols, static_cols, y_idx):
+            plan = _ColumnPlan(
+                temporal_cols=temporal_cols,
+                static_cols=static_cols,
+                y_idx=y_idx,
+                temporal_data_cols=self._get_temporal_exogenous_cols(temporal_cols),
+                hist_exog_list=self.hist_exog_list,
+                futr_exog_list=self.futr_exog_list,
+                stat_exog_list=self.stat_exog_list,
+            )
+            self._cached_column_plan = plan
+        return plan
 
     def _set_quantile_for_iqloss(self, **data_module_kwargs):
         if "quantile" in data_module_kwargs:
@@ -322,13 +417,14 @@ class BaseModel(pl.LightningModule):
         random_seed=None,
         shuffle_train=True,
         distributed_config=None,
+        **data_module_kwargs,
     ):
         self._check_exog(dataset)
         self._restart_seed(random_seed)
 
         self.val_size = val_size
         self.test_size = test_size
-        is_local = isinstance(dataset, TimeSeriesDataset)
+        is_local = isinstance(dataset, (TimeSeriesDataset, ParquetTimeSeriesDataset))
         if is_local:
             datamodule_constructor = TimeSeriesDataModule
         else:
@@ -340,6 +436,9 @@ class BaseModel(pl.LightningModule):
             num_workers=self.num_workers_loader,
             drop_last=self.drop_last_loader,
             shuffle_train=shuffle_train,
+            bucket_by_length=self.bucket_by_length,
+            pin_memory=self.pin_memory_loader,
+            **data_module_kwargs,
         )
 
         if self.val_check_steps > self.max_steps:
@@ -366,6 +465,65 @@ class BaseModel(pl.LightningModule):
             )
         return model
 
+    def _inference_lookback(self):
+        # Number of past timestamps of each serie read by `predict`, None if all of them
+        return None
+
+    def _shared_windows_key(self):
+        # Models with the same key can be predicted together with `_predict_shared`
+        return None
+
+    def _inference_device(self, trainer_kwargs):
+        accelerator = trainer_kwargs.get("accelerator", "auto")
+        if accelerator in ("gpu", "cuda", "auto") and torch.cuda.is_available():
+            devices = trainer_kwargs.get("devices", None)
+            index = devices[0] if isinstance(devices, (list, tuple)) else 0
+            return torch.device("cuda", index)
+        if accelerator in ("mps", "auto") and torch.backends.mps.is_available():
+            return torch.device("mps")
+        return torch.device("cpu")
+
+    def _predict_batches(self, datamodule, trainer_kwargs):
+        """Outputs of `predict_step` for every batch of the datamodule, on cpu.
+
+        With `inference_engine='torch'` the batches are fed to `predict_step` in a
+        plain loop under `torch.inference_mode`, which skips building a PL Trainer.
+        Models with a reduced training `precision` always go through the Trainer.
+        """
+        precision = trainer_kwargs.get("precision", None)
+        if self.inference_engine == "lightning" or precision not in (
+            None,
+            32,
+            "32",
+            "32-true",
+        ):
+            trainer = pl.Trainer(**trainer_kwargs)
+            return trainer.predict(self, datamodule=datamodule)
+
+        device = self._inference_device(trainer_kwargs)
+        param = next(self.parameters(), None)
+        original_device = param.device if param is not None else torch.device("cpu")
+        was_training = self.training
+        self.to(device)
+        self.eval()
+        fcsts = []
+        try:
+            with torch.inference_mode():
+                for batch_idx, batch in enumerate(datamodule.predict_dataloader()):
+                    batch = {
+                        k: (
+                            v.to(device, non_blocking=True)
+                            if isinstance(v, torch.Tensor)
+                            else v
+                        )
+                        for k, v in batch.items()
+                    }
+                    fcsts.append(self.predict_step(batch, batch_idx).cpu())
+        finally:
+            self.to(original_device)
+            self.train(was_training)
+        return fcsts
+
     def on_fit_start(self):
         torch.manual_seed(self.random_seed)
         np.random.seed(self.random_seed)
@@ -418,6 +576,12 @@ class BaseModel(pl.LightningModule):
     def set_test_size(self, test_size):
         self.test_size = test_size
 
+    def on_train_epoch_end(self):
+        # Padding avoided by batching series of similar lengths
+        batch_sampler = getattr(self.trainer.train_dataloader, "batch_sampler", None)
+        if isinstance(batch_sampler, _LengthBucketBatchSampler):
+            self.log("padding_ratio_saved", batch_sampler.padding_ratio_saved)
+
     def on_validation_epoch_end(self):
         if self.val_size == 0:
             return
@@ -7,13 +7,11 @@ __all__ = ['BaseMultivariate']
 import numpy as np
 import torch
 import torch.nn as nn
-import pytorch_lightning as pl
 import neuralforecast.losses.pytorch as losses
 
 from ._base_model import BaseModel
 from ._scalers import TemporalNorm
 from ..tsdataset import TimeSeriesDataModule
-from ..utils import get_indexer_raise_missing
 
 # %% ../../nbs/common.base_multivariate.ipynb 6
 class BaseMultivariate(BaseModel):
@@ -148,7 +146,9 @@ class BaseMultivariate(BaseModel):
             # [n_series, C, Ws, L+H] 0, 1, 2, 3
 
             # Sample and Available conditions
-            available_idx = temporal_cols.get_loc("available_mask")
+            available_idx = self._column_plan(
+                temporal_cols, batch.get("static_cols", None), batch["y_idx"]
+            ).mask_idx
             sample_condition = windows[:, available_idx, :, -self.h :]
             sample_condition = torch.sum(sample_condition, axis=2)  # Sum over time
             sample_condition = torch.sum(
@@ -243,18 +243,14 @@ class BaseMultivariate(BaseModel):
         # windows are already filtered by train/validation/test
         # from the `create_windows_method` nor leakage risk
         temporal = windows["temporal"]  # [Ws, C, L+H, n_series]
-        temporal_cols = windows["temporal_cols"].copy()  # [Ws, C, L+H, n_series]
+        plan = self._column_plan(
+            windows["temporal_cols"], windows["static_cols"], y_idx
+        )
 
         # To avoid leakage uses only the lags
-        temporal_data_cols = self._get_temporal_exogenous_cols(
-            temporal_cols=temporal_cols
-        )
-        temporal_idxs = get_indexer_raise_missing(temporal_cols, temporal_data_cols)
-        temporal_idxs = np.append(y_idx, temporal_idxs)
+        temporal_idxs = plan.idxs("data", temporal.device)
         temporal_data = temporal[:, temporal_idxs, :, :]
-        temporal_mask = temporal[
-            :, temporal_cols.get_loc("available_mask"), :, :
-        ].clone()
+        temporal_mask = temporal[:, plan.mask_idx, :, :].clone()
         temporal_mask[:, -self.h :, :] = 0.0
 
         # Normalize. self.scaler stores the shift and scale for inverse transform
@@ -298,8 +294,11 @@ class BaseMultivariate(BaseModel):
         # Temporal: [Ws, C, L+H, n_series]
 
         # Filter insample lags from outsample horizon
-        mask_idx = batch["temporal_cols"].get_loc("available_mask")
         y_idx = batch["y_idx"]
+        plan = self._column_plan(
+            windows["temporal_cols"], windows["static_cols"], y_idx
+        )
+        mask_idx = plan.mask_idx
         insample_y = windows["temporal"][:, y_idx, : -self.h, :]
         insample_mask = windows["temporal"][:, mask_idx, : -self.h, :]
         outsample_y = windows["temporal"][:, y_idx, -self.h :, :]
@@ -307,27 +306,21 @@ class BaseMultivariate(BaseModel):
 
         # Filter historic exogenous variables
         if len(self.hist_exog_list):
-            hist_exog_idx = get_indexer_raise_missing(
-                windows["temporal_cols"], self.hist_exog_list
-            )
+            hist_exog_idx = plan.idxs("hist", windows["temporal"].device)
             hist_exog = windows["temporal"][:, hist_exog_idx, : -self.h, :]
         else:
             hist_exog = None
 
         # Filter future exogenous variables
         if len(self.futr_exog_list):
-            futr_exog_idx = get_indexer_raise_missing(
-                windows["temporal_cols"], self.futr_exog_list
-            )
+            futr_exog_idx = plan.idxs("futr", windows["temporal"].device)
             futr_exog = windows["temporal"][:, futr_exog_idx, :, :]
         else:
             futr_exog = None
 
         # Filter static variables
         if len(self.stat_exog_list):
-            static_idx = get_indexer_raise_missing(
-                windows["static_cols"], self.stat_exog_list
-            )
+            static_idx = plan.idxs("stat", windows["static"].device)
             stat_exog = windows["static"][:, static_idx]
         else:
             stat_exog = None
@@ -555,6 +548,10 @@ class BaseMultivariate(BaseModel):
             distributed_config=None,
         )
 
+    def _inference_lookback(self):
+        # The predicted windows only read the last `input_size` timestamps
+        return self.input_size
+
     def predict(
         self,
         dataset,
@@ -565,7 +562,8 @@ class BaseMultivariate(BaseModel):
     ):
         """Predict.
 
-        Neural network prediction with PL's `Trainer` execution of `predict_step`.
+        Neural network prediction with PL's `Trainer` execution of `predict_step`,
+        or a plain torch loop when the model's `inference_engine='torch'`.
 
         **Parameters:**<br>
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
@@ -593,8 +591,7 @@ class BaseMultivariate(BaseModel):
         ):
             pred_trainer_kwargs["devices"] = [0]
 
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-        fcsts = trainer.predict(self, datamodule=datamodule)
+        fcsts = self._predict_batches(datamodule, pred_trainer_kwargs)
         fcsts = torch.vstack(fcsts).numpy()
 
         fcsts = np.transpose(fcsts, (2, 0, 1))
@@ -7,13 +7,12 @@ __all__ = ['BaseRecurrent']
 import numpy as np
 import torch
 import torch.nn as nn
-import pytorch_lightning as pl
+import torch.nn.functional as F
 import neuralforecast.losses.pytorch as losses
 
 from ._base_model import BaseModel
 from ._scalers import TemporalNorm
 from ..tsdataset import TimeSeriesDataModule
-from ..utils import get_indexer_raise_missing
 
 # %% ../../nbs/common.base_recurrent.ipynb 7
 class BaseRecurrent(BaseModel):
@@ -26,8 +25,29 @@ class BaseRecurrent(BaseModel):
     - PyTorch Lightning's methods training_step, validation_step, predict_step. <br>
     - fit and predict methods used by NeuralForecast.core class. <br>
     - sampling and wrangling methods to sequential windows. <br>
+
+    With `hidden_state_cache=True` the final hidden state of the encoder is saved for each
+    serie predicted by `NeuralForecast` from its stored dataset. Later predictions resume from
+    it and only unroll the encoder over the new observations. The states of a batch are
+    recomputed from scratch when any of its series lacks one, when the series got a different
+    number of new observations or when their `scaler_type` statistics changed.
+
+    With `tbptt_steps > 0` the models are trained with truncated backpropagation through
+    time: each training sequence is unrolled in consecutive chunks of `tbptt_steps`
+    timestamps and the encoder state is detached and carried from one chunk to the next,
+    so that the memory is bounded by the chunk length. The gradients of the chunks are
+    accumulated into a single optimizer step per batch.
+
+    With `pack_sequences=True` the encoder skips the timestamps of each serie before its
+    first available one, using packed sequences. The series of a training batch then keep
+    their history before the start of the shortest one, instead of being truncated to it.
     """
 
+    # Whether `forward` resumes from and returns `windows_batch['encoder_state']`
+    STATEFUL = False
+    # Whether the encoder is unrolled with `_unroll_encoder`, which can pack sequences
+    PACKED_ENCODER = False
+
     def __init__(
         self,
         h,
@@ -54,6 +74,9 @@ class BaseRecurrent(BaseModel):
         optimizer_kwargs=None,
         lr_scheduler=None,
         lr_scheduler_kwargs=None,
+        hidden_state_cache=False,
+        tbptt_steps=0,
+        pack_sequences=False,
         **trainer_kwargs,
     ):
         super().__init__(
@@ -123,19 +146,54 @@ class BaseRecurrent(BaseModel):
         self.validation_step_outputs = []
         self.alias = alias
 
+        # Final encoder states by serie key, see `_resume_encoder_state`
+        if hidden_state_cache and not self.STATEFUL:
+            raise Exception(
+                f"{type(self).__name__} does not support hidden_state_cache."
+            )
+        if hidden_state_cache and self.inference_input_size > 0:
+            raise Exception(
+                "hidden_state_cache requires the whole history, set inference_input_size=-1."
+            )
+        self.hidden_state_cache = hidden_state_cache
+        self._encoder_states = {}
+        self._state_keys = None
+        self._state_sizes = None
+        self._state_offset = 0
+
+        # Truncated backpropagation through time, see `_tbptt_loss`
+        if tbptt_steps > 0 and not self.STATEFUL:
+            raise Exception(f"{type(self).__name__} does not support tbptt_steps.")
+        self.tbptt_steps = tbptt_steps
+        self.tbptt_gradient_clip_val = None
+        self.tbptt_gradient_clip_algorithm = None
+        if tbptt_steps > 0:
+            # The optimizer steps once all the chunks are backpropagated. PL doesn't
+            # clip the gradients of manual optimization, `_tbptt_loss` does
+            self.automatic_optimization = False
+            self.tbptt_gradient_clip_val = self.trainer_kwargs.pop(
+                "gradient_clip_val", None
+            )
+            self.tbptt_gradient_clip_algorithm = self.trainer_kwargs.pop(
+                "gradient_clip_algorithm", None
+            )
+
+        # Skip the padding of the series, see `_unroll_encoder`
+        if pack_sequences and not self.PACKED_ENCODER:
+            raise Exception(f"{type(self).__name__} does not support pack_sequences.")
+        self.pack_sequences = pack_sequences
+
     def _normalization(self, batch, val_size=0, test_size=0):
         temporal = batch["temporal"]  # B, C, T
-        temporal_cols = batch["temporal_cols"].copy()
         y_idx = batch["y_idx"]
+        plan = self._column_plan(
+            batch["temporal_cols"], batch.get("static_cols", None), y_idx
+        )
 
         # Separate data and mask
-        temporal_data_cols = self._get_temporal_exogenous_cols(
-            temporal_cols=temporal_cols
-        )
-        temporal_idxs = get_indexer_raise_missing(temporal_cols, temporal_data_cols)
-        temporal_idxs = np.append(y_idx, temporal_idxs)
+        temporal_idxs = plan.idxs("data", temporal.device)
         temporal_data = temporal[:, temporal_idxs, :]
-        temporal_mask = temporal[:, temporal_cols.get_loc("available_mask"), :].clone()
+        temporal_mask = temporal[:, plan.mask_idx, :].clone()
 
         # Remove validation and test set to prevent leakeage
         if val_size + test_size > 0:
@@ -182,12 +240,13 @@ class BaseRecurrent(BaseModel):
                 temporal = temporal[:, :, :cutoff]
             temporal = self.padder(temporal)
 
-            # Truncate batch to shorter time-series
-            av_condition = torch.nonzero(
-                torch.min(
-                    temporal[:, temporal_cols.get_loc("available_mask")], axis=0
-                ).values
-            )
+            # Truncate batch to shorter time-series, or to the longest one
+            # when the padding of the others is skipped by packed sequences
+            mask_idx = self._column_plan(
+                temporal_cols, batch.get("static_cols", None), batch["y_idx"]
+            ).mask_idx
+            reduce = torch.max if self.pack_sequences else torch.min
+            av_condition = torch.nonzero(reduce(temporal[:, mask_idx], axis=0).values)
             min_time_stamp = int(av_condition.min())
 
             available_ts = temporal.shape[-1] - min_time_stamp
@@ -213,31 +272,30 @@ class BaseRecurrent(BaseModel):
                 padder_left = nn.ConstantPad1d(padding=(1, 0), value=0)
                 temporal = padder_left(temporal)
 
-        # Parse batch
-        window_size = 1 + self.h  # 1 for current t and h for future
-        windows = temporal.unfold(dimension=-1, size=window_size, step=1)
+        # The windows are not materialized, the window of timestamp t is
+        # temporal[:, :, t : t+1+H], 1 for current t and h for future
+        n_windows = temporal.shape[-1] - self.h
 
         # Truncated backprogatation/inference (shorten sequence where RNNs unroll)
-        n_windows = windows.shape[2]
         input_size = -1
         if (step == "train") and (self.input_size > 0):
             input_size = self.input_size
             if (input_size > 0) and (n_windows > input_size):
                 max_sampleable_time = n_windows - self.input_size + 1
                 start = np.random.choice(max_sampleable_time)
-                windows = windows[:, :, start : (start + input_size), :]
+                temporal = temporal[:, :, start : (start + input_size + self.h)]
 
         if (step == "val") and (self.inference_input_size > 0):
             cutoff = self.inference_input_size + self.val_size
-            windows = windows[:, :, -cutoff:, :]
+            temporal = temporal[:, :, -(cutoff + self.h) :]
 
         if (step == "predict") and (self.inference_input_size > 0):
             cutoff = self.inference_input_size + self.test_size
-            windows = windows[:, :, -cutoff:, :]
+            temporal = temporal[:, :, -(cutoff + self.h) :]
 
-        # [B, C, input_size, 1+H]
+        # [B, C, input_size+H]
         windows_batch = dict(
-            temporal=windows,
+            temporal=temporal,
             temporal_cols=temporal_cols,
             static=batch.get("static", None),
             static_cols=batch.get("static_cols", None),
@@ -246,37 +304,37 @@ class BaseRecurrent(BaseModel):
         return windows_batch
 
     def _parse_windows(self, batch, windows):
-        # [B, C, seq_len, 1+H]
+        # [B, C, seq_len+H]
         # Filter insample lags from outsample horizon
-        mask_idx = batch["temporal_cols"].get_loc("available_mask")
         y_idx = batch["y_idx"]
-        insample_y = windows["temporal"][:, y_idx, :, : -self.h]
-        insample_mask = windows["temporal"][:, mask_idx, :, : -self.h]
-        outsample_y = windows["temporal"][:, y_idx, :, -self.h :].contiguous()
-        outsample_mask = windows["temporal"][:, mask_idx, :, -self.h :].contiguous()
+        plan = self._column_plan(
+            windows["temporal_cols"], windows["static_cols"], y_idx
+        )
+        mask_idx = plan.mask_idx
+        seq_len = windows["temporal"].shape[-1] - self.h
+        insample_y = windows["temporal"][:, y_idx, :seq_len, None]
+        insample_mask = windows["temporal"][:, mask_idx, :seq_len, None]
+        # The horizons of the windows are strided views, [B, seq_len, H]
+        outsample_y = windows["temporal"][:, y_idx, 1:].unfold(-1, self.h, 1)
+        outsample_mask = windows["temporal"][:, mask_idx, 1:].unfold(-1, self.h, 1)
 
         # Filter historic exogenous variables
         if len(self.hist_exog_list):
-            hist_exog_idx = get_indexer_raise_missing(
-                windows["temporal_cols"], self.hist_exog_list
-            )
-            hist_exog = windows["temporal"][:, hist_exog_idx, :, : -self.h]
+            hist_exog_idx = plan.idxs("hist", windows["temporal"].device)
+            hist_exog = windows["temporal"][:, hist_exog_idx, :seq_len, None]
         else:
             hist_exog = None
 
-        # Filter future exogenous variables
+        # Filter future exogenous variables, their horizons are gathered by the
+        # models with `_futr_exog_horizons`
         if len(self.futr_exog_list):
-            futr_exog_idx = get_indexer_raise_missing(
-                windows["temporal_cols"], self.futr_exog_list
-            )
-            futr_exog = windows["temporal"][:, futr_exog_idx, :, :]
+            futr_exog_idx = plan.idxs("futr", windows["temporal"].device)
+            futr_exog = windows["temporal"][:, futr_exog_idx, :]
         else:
             futr_exog = None
         # Filter static variables
         if len(self.stat_exog_list):
-            static_idx = get_indexer_raise_missing(
-                windows["static_cols"], self.stat_exog_list
-            )
+            static_idx = plan.idxs("stat", windows["static"].device)
             stat_exog = windows["static"][:, static_idx]
         else:
             stat_exog = None
@@ -291,14 +349,104 @@ class BaseRecurrent(BaseModel):
             stat_exog,
         )
 
-    def training_step(self, batch, batch_idx):
-        # Create and normalize windows [Ws, L+H, C]
-        batch = self._normalization(
-            batch, val_size=self.val_size, test_size=self.test_size
+    def _futr_exog_horizons(self, futr_exog):
+        # Strided view of the future exogenous of the horizon of each window
+        # [B, F, seq_len+H] -> [B, seq_len, H, F]
+        return futr_exog[:, :, 1:].unfold(-1, self.h, 1).permute(0, 2, 3, 1)
+
+    def _adapt_context(
+        self, context_adapter, hidden_state, futr_exog, windows=slice(None)
+    ):
+        # Applies the nn.Linear `context_adapter` to the hidden_state [B, n_windows, hidden]
+        # of the `windows` concatenated with the future exogenous of their horizons, without
+        # materializing the horizons. The weights of the future exogenous are a convolution
+        # of width H over futr_exog [B, F, seq_len+H]. Returns [B, n_windows, context_size*H]
+        hidden_size = hidden_state.shape[-1]
+        context = F.linear(
+            hidden_state, context_adapter.weight[:, :hidden_size], context_adapter.bias
         )
-        windows = self._create_windows(batch, step="train")
+        if self.futr_exog_size == 0:
+            return context
 
-        # Parse windows
+        # The unfolded horizons were flattened as [H, F], the kernels are [F, H]
+        kernel = context_adapter.weight[:, hidden_size:].reshape(
+            -1, self.h, self.futr_exog_size
+        )
+        start, stop, step = windows.indices(futr_exog.shape[-1] - self.h)
+        futr_context = F.conv1d(
+            futr_exog[:, :, 1 + start : stop + self.h],
+            kernel.transpose(1, 2),
+            stride=step,
+        )
+        return context + futr_context.transpose(1, 2)
+
+    def _unroll_encoder(self, encoder, encoder_input, windows_batch):
+        # Unrolls a batch_first torch RNN, GRU or LSTM `encoder` over the encoder_input
+        # [B, seq_len, C] from windows_batch['encoder_state']. Returns its outputs
+        # [B, seq_len, hidden] and its final state as a tuple of [layers, B, hidden].
+        # With `pack_sequences` the timestamps of each serie before its first available
+        # one are skipped, their outputs are zeros
+        is_lstm = isinstance(encoder, nn.LSTM)
+        encoder_state = windows_batch.get("encoder_state")
+        if not self.pack_sequences:
+            if encoder_state is not None and not is_lstm:
+                encoder_state = encoder_state[0]
+            hidden_state, encoder_state = encoder(encoder_input, encoder_state)
+            return hidden_state, encoder_state if is_lstm else (encoder_state,)
+
+        batch_size, seq_len, n_features = encoder_input.shape
+        available = windows_batch["insample_mask"].reshape(batch_size, seq_len) > 0
+        starts = torch.where(
+            available.any(dim=1), available.int().argmax(dim=1), seq_len
+        )
+        lengths = seq_len - starts
+        if encoder_state is None:
+            shape = (
+                encoder.num_layers * (1 + encoder.bidirectional),
+                batch_size,
+                encoder.hidden_size,
+            )
+            encoder_state = tuple(
+                encoder_input.new_zeros(shape) for _ in range(1 + is_lstm)
+            )
+        hidden_size = encoder.hidden_size * (1 + encoder.bidirectional)
+        hidden_state = encoder_input.new_zeros(batch_size, seq_len, hidden_size)
+        # Series without available timestamps keep their state
+        rows = torch.nonzero(lengths > 0).flatten()
+        if rows.numel() == 0:
+            return hidden_state, encoder_state
+
+        # Packed sequences start at the first timestamp
+        steps = torch.arange(seq_len, device=encoder_input.device)
+        idxs = (steps + starts[rows, None]).clamp(max=seq_len - 1)
+        inputs = encoder_input[rows].gather(
+            1, idxs[:, :, None].expand(-1, -1, n_features)
+        )
+        packed = nn.utils.rnn.pack_padded_sequence(
+            inputs, lengths[rows].cpu(), batch_first=True, enforce_sorted=False
+        )
+        hx = tuple(state[:, rows] for state in encoder_state)
+        packed, hx = encoder(packed, hx if is_lstm else hx[0])
+        outputs, _ = nn.utils.rnn.pad_packed_sequence(
+            packed, batch_first=True, total_length=seq_len
+        )
+
+        # Outputs back at the end of the sequence
+        idxs = steps - starts[rows, None]
+        outputs = outputs.gather(
+            1, idxs.clamp(min=0)[:, :, None].expand(-1, -1, hidden_size)
+        )
+        outputs = outputs * (idxs >= 0)[:, :, None]
+        hidden_state = hidden_state.index_copy(0, rows, outputs)
+        encoder_state = tuple(
+            state.index_copy(1, rows, new_state)
+            for state, new_state in zip(encoder_state, hx if is_lstm else (hx,))
+        )
+        return hidden_state, encoder_state
+
+    def _train_loss(self, batch, windows, encoder_state=None):
+        # Training loss of the windows, unrolling the encoder from `encoder_state`.
+        # Returns the loss, the final encoder state and the logged batch size
         (
             insample_y,
             insample_mask,
@@ -308,14 +456,18 @@ class BaseRecurrent(BaseModel):
             futr_exog,
             stat_exog,
         ) = self._parse_windows(batch, windows)
+        if self.pack_sequences:
+            # No loss on the windows before the first available timestamp of the serie
+            outsample_mask = outsample_mask * insample_mask.cummax(dim=1).values
 
         windows_batch = dict(
             insample_y=insample_y,  # [B, seq_len, 1]
             insample_mask=insample_mask,  # [B, seq_len, 1]
-            futr_exog=futr_exog,  # [B, F, seq_len, 1+H]
-            hist_exog=hist_exog,  # [B, C, seq_len]
-            stat_exog=stat_exog,
-        )  # [B, S]
+            futr_exog=futr_exog,  # [B, F, seq_len+H]
+            hist_exog=hist_exog,  # [B, X, seq_len, 1]
+            stat_exog=stat_exog,  # [B, S]
+            encoder_state=encoder_state,
+        )
 
         # Model predictions
         output = self(windows_batch)  # tuple([B, seq_len, H, output])
@@ -330,7 +482,7 @@ class BaseRecurrent(BaseModel):
             H = output[0].size()[2]
             output = [arg.view(-1, *(arg.size()[2:])) for arg in output]
             outsample_y = outsample_y.view(B * T, H)
-            outsample_mask = outsample_mask.view(B * T, H)
+            outsample_mask = outsample_mask.reshape(B * T, H)
             y_loc = y_loc.repeat_interleave(repeats=T, dim=0).squeeze(-1)
             y_scale = y_scale.repeat_interleave(repeats=T, dim=0).squeeze(-1)
             distr_args = self.loss.scale_decouple(
@@ -347,14 +499,62 @@ class BaseRecurrent(BaseModel):
             print("output", torch.isnan(output).sum())
             raise Exception("Loss is NaN, training stopped.")
 
+        return loss, windows_batch.get("encoder_state"), outsample_y.size(0)
+
+    def _tbptt_loss(self, batch, windows):
+        # Truncated backpropagation through time. The windows are unrolled in chunks of
+        # `tbptt_steps`, carrying the detached encoder state from one chunk to the next,
+        # and the gradients of each chunk are accumulated before a single optimizer step
+        optimizer = self.optimizers()
+        optimizer.zero_grad()
+        n_windows = windows["temporal"].shape[2] - self.h
+        encoder_state = None
+        loss = 0.0
+        for start in range(0, n_windows, self.tbptt_steps):
+            end = min(start + self.tbptt_steps, n_windows)
+            chunk = dict(
+                windows, temporal=windows["temporal"][:, :, start : end + self.h]
+            )
+            chunk_loss, encoder_state, batch_size = self._train_loss(
+                batch, chunk, encoder_state
+            )
+            # Chunks are weighted by their number of windows
+            chunk_loss = chunk_loss * (end - start) / n_windows
+            self.manual_backward(chunk_loss)
+            encoder_state = tuple(state.detach() for state in encoder_state)
+            loss = loss + chunk_loss.detach()
+
+        if self.tbptt_gradient_clip_val is not None:
+            self.clip_gradients(
+                optimizer,
+                gradient_clip_val=self.tbptt_gradient_clip_val,
+                gradient_clip_algorithm=self.tbptt_gradient_clip_algorithm,
+            )
+        optimizer.step()
+        self.lr_schedulers().step()
+        return loss, batch_size
+
+    def training_step(self, batch, batch_idx):
+        # Create and normalize windows [Ws, L+H, C]
+        batch = self._normalization(
+            batch, val_size=self.val_size, test_size=self.test_size
+        )
+        windows = self._create_windows(batch, step="train")
+        # The manual optimizer step of tbptt increments global_step before the trajectory is kept
+        step = self.global_step
+        if self.tbptt_steps > 0:
+            loss, batch_size = self._tbptt_loss(batch, windows)
+        else:
+            loss, _, batch_size = self._train_loss(batch, windows)
+
         self.log(
             "train_loss",
             loss.item(),
-            batch_size=outsample_y.size(0),
+            batch_size=batch_size,
             prog_bar=True,
             on_epoch=True,
         )
-        self.train_trajectories.append((self.global_step, loss.item()))
+        self.train_trajectories.append((step, loss.item()))
         return loss
 
     def validation_step(self, batch, batch_idx):
@@ -382,8 +582,8 @@ class BaseRecurrent(BaseModel):
         windows_batch = dict(
             insample_y=insample_y,  # [B, seq_len, 1]
             insample_mask=insample_mask,  # [B, seq_len, 1]
-            futr_exog=futr_exog,  # [B, F, seq_len, 1+H]
-            hist_exog=hist_exog,  # [B, C, seq_len]
+            futr_exog=futr_exog,  # [B, F, seq_len+H]
+            hist_exog=hist_exog,  # [B, X, seq_len, 1]
             stat_exog=stat_exog,
         )  # [B, S]
 
@@ -469,13 +669,30 @@ class BaseRecurrent(BaseModel):
         windows_batch = dict(
             insample_y=insample_y,  # [B, seq_len, 1]
             insample_mask=insample_mask,  # [B, seq_len, 1]
-            futr_exog=futr_exog,  # [B, F, seq_len, 1+H]
-            hist_exog=hist_exog,  # [B, C, seq_len]
+            futr_exog=futr_exog,  # [B, F, seq_len+H]
+            hist_exog=hist_exog,  # [B, X, seq_len, 1]
             stat_exog=stat_exog,
         )  # [B, S]
 
+        # Resume the encoder of the series with cached states
+        keys = None
+        if self._state_keys is not None:
+            start = self._state_offset
+            self._state_offset += insample_y.shape[0]
+            keys = self._state_keys[start : self._state_offset]
+            sizes = self._state_sizes[start : self._state_offset]
+            self._resume_encoder_state(windows_batch, keys, sizes)
+
+        # Only the forecasts returned by `predict` are decoded, the unroll has one window by timestamp
+        windows_batch["output_windows"] = self._predict_windows(
+            seq_len=windows_batch["insample_y"].shape[1]
+        )
+
         # Model Predictions
-        output = self(windows_batch)  # tuple([B, seq_len, H], ...)
+        output = self(windows_batch)  # tuple([B, n_windows, H], ...)
+        if keys is not None:
+            self._save_encoder_state(windows_batch["encoder_state"], keys, sizes)
+
         if self.loss.is_distribution_output:
             _, y_loc, y_scale = self._inv_normalization(
                 y_hat=output[0], temporal_cols=batch["temporal_cols"], y_idx=y_idx
@@ -503,6 +720,69 @@ class BaseRecurrent(BaseModel):
             )
         return y_hat
 
+    def _inference_lookback(self):
+        # The unroll of `predict` starts `inference_input_size` timestamps before the test set,
+        # but scalers other than the identity normalize with the statistics of the whole history
+        if self.inference_input_size > 0 and self.scaler.scaler_type == "identity":
+            return self.inference_input_size + self.h
+        return None
+
+    def _predict_windows(self, seq_len):
+        # Slice of the unrolled windows forecasted by `predict`: the last one, or
+        # the 1+test_size-h windows of the test set every `predict_step_size`
+        n_windows = 1 + max(self.test_size - self.h, 0)
+        return slice(max(seq_len - n_windows, 0), seq_len, self.predict_step_size)
+
+    def _resume_encoder_state(self, windows_batch, keys, sizes):
+        # Keeps the new timestamps of `windows_batch` and sets their initial encoder
+        # state, if all the series resume from a state with the current scaler statistics
+        entries = [self._encoder_states.get(key) for key in keys]
+        if any(entry is None for entry in entries):
+            return
+        n_new = sizes - np.array([entry[0] for entry in entries])
+        seq_len = windows_batch["insample_y"].shape[1]
+        if n_new[0] < 1 or n_new[0] > seq_len or (n_new != n_new[0]).any():
+            return
+        device = self.scaler.x_shift.device
+        x_shift = torch.stack([entry[1] for entry in entries]).to(device)
+        x_scale = torch.stack([entry[2] for entry in entries]).to(device)
+        if not (
+            torch.equal(x_shift, self.scaler.x_shift[:, :, 0])
+            and torch.equal(x_scale, self.scaler.x_scale[:, :, 0])
+        ):
+            return
+
+        n_new = int(n_new[0])
+        windows_batch["insample_y"] = windows_batch["insample_y"][:, -n_new:]
+        windows_batch["insample_mask"] = windows_batch["insample_mask"][:, -n_new:]
+        if windows_batch["hist_exog"] is not None:
+            windows_batch["hist_exog"] = windows_batch["hist_exog"][:, :, -n_new:]
+        if windows_batch["futr_exog"] is not None:
+            futr_exog = windows_batch["futr_exog"]
+            windows_batch["futr_exog"] = futr_exog[:, :, -(n_new + self.h) :]
+        windows_batch["encoder_state"] = tuple(
+            torch.cat(states, dim=1).to(device)
+            for states in zip(*(entry[3] for entry in entries))
+        )
+
+    def _save_encoder_state(self, encoder_state, keys, sizes):
+        # Final encoder state of each serie, with the number of timestamps it covers
+        # and the scaler statistics of its inputs. States have the series in dim 1
+        x_shift = self.scaler.x_shift[:, :, 0].cpu()
+        x_scale = self.scaler.x_scale[:, :, 0].cpu()
+        encoder_state = [state.detach().cpu() for state in encoder_state]
+        for i, key in enumerate(keys):
+            self._encoder_states[key] = (
+                int(sizes[i]),
+                x_shift[i],
+                x_scale[i],
+                tuple(state[:, i : i + 1].clone() for state in encoder_state),
+            )
+
+    def clear_hidden_states(self):
+        """Drop the encoder states saved with `hidden_state_cache`."""
+        self._encoder_states = {}
+
     def fit(
         self,
         dataset,
@@ -532,6 +812,7 @@ class BaseRecurrent(BaseModel):
         `test_size`: int, test size for temporal cross-validation.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
         """
+        self.clear_hidden_states()
         return self._fit(
             dataset=dataset,
             batch_size=self.batch_size,
@@ -542,23 +823,32 @@ class BaseRecurrent(BaseModel):
             distributed_config=distributed_config,
         )
 
-    def predict(self, dataset, step_size=1, random_seed=None, **data_module_kwargs):
+    def predict(
+        self,
+        dataset,
+        step_size=1,
+        random_seed=None,
+        state_keys=None,
+        **data_module_kwargs,
+    ):
         """Predict.
 
-        Neural network prediction with PL's `Trainer` execution of `predict_step`.
+        Neural network prediction with PL's `Trainer` execution of `predict_step`,
+        or a plain torch loop when the model's `inference_engine='torch'`.
 
         **Parameters:**<br>
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
         `step_size`: int=1, Step size between each window.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
+        `state_keys`: list, optional, key of each serie of `dataset` under which its encoder state is cached with `hidden_state_cache`.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
         self._check_exog(dataset)
         self._restart_seed(random_seed)
         data_module_kwargs = self._set_quantile_for_iqloss(**data_module_kwargs)
 
-        if step_size > 1:
-            raise Exception("Recurrent models do not support step_size > 1")
+        # Forecasts of every `step_size` windows of the single unroll
+        self.predict_step_size = step_size
 
         # fcsts (window, batch, h)
         # Protect when case of multiple gpu. PL does not support return preds with multiple gpu.
@@ -568,24 +858,31 @@ class BaseRecurrent(BaseModel):
         ):
             pred_trainer_kwargs["devices"] = [0]
 
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             valid_batch_size=self.valid_batch_size,
             num_workers=self.num_workers_loader,
             **data_module_kwargs,
         )
-        fcsts = trainer.predict(self, datamodule=datamodule)
-        if self.test_size > 0:
-            # Remove warmup windows (from train and validation)
-            # [N,T,H,output], avoid indexing last dim for univariate output compatibility
-            fcsts = torch.vstack(
-                [fcst[:, -(1 + self.test_size - self.h) :, :] for fcst in fcsts]
-            )
-            fcsts = fcsts.numpy().flatten()
-            fcsts = fcsts.reshape(-1, len(self.loss.output_names))
-        else:
-            fcsts = torch.vstack([fcst[:, -1:, :] for fcst in fcsts]).numpy().flatten()
-            fcsts = fcsts.reshape(-1, len(self.loss.output_names))
+        # Encoder states are only cached for the forecasts after the end of the series
+        if (
+            state_keys is not None
+            and self.hidden_state_cache
+            and self.test_size == self.h
+        ):
+            if len(state_keys) != dataset.n_groups:
+                raise ValueError(
+                    "`state_keys` must have one key by serie of `dataset`."
+                )
+            self._state_keys = list(state_keys)
+            self._state_sizes = np.diff(dataset.indptr) - self.test_size
+            self._state_offset = 0
+        try:
+            fcsts = self._predict_batches(datamodule, pred_trainer_kwargs)
+        finally:
+            self._state_keys = self._state_sizes = None
+        # Warmup windows (from train and validation) are removed by `predict_step`
+        # [N,T,H,output], avoid indexing last dim for univariate output compatibility
+        fcsts = torch.vstack(fcsts).numpy().flatten()
+        fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
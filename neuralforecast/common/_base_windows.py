@@ -12,7 +12,6 @@ import pytorch_lightning as pl
 from ._base_model import BaseModel
 from ._scalers import TemporalNorm
 from ..tsdataset import TimeSeriesDataModule
-from ..utils import get_indexer_raise_missing
 
 # %% ../../nbs/common.base_windows.ipynb 6
 class BaseWindows(BaseModel):
@@ -57,6 +56,7 @@ class BaseWindows(BaseModel):
         optimizer_kwargs=None,
         lr_scheduler=None,
         lr_scheduler_kwargs=None,
+        train_sampling="series",
         **trainer_kwargs,
     ):
         super().__init__(
@@ -110,6 +110,11 @@ class BaseWindows(BaseModel):
         self.val_check_steps = val_check_steps
         self.windows_batch_size = windows_batch_size
         self.step_size = step_size
+        if train_sampling not in ["series", "windows"]:
+            raise ValueError(
+                f"train_sampling must be one of series, windows, got {train_sampling}"
+            )
+        self.train_sampling = train_sampling
 
         self.exclude_insample_y = exclude_insample_y
 
@@ -134,72 +139,137 @@ class BaseWindows(BaseModel):
         self.validation_step_outputs = []
         self.alias = alias
 
+    def _inference_windows_plan(self, n_time, step):
+        """Layout of the 'predict' or 'val' windows of series with `n_time` timestamps.
+
+        Returns the position of the start of the first window, the step between
+        windows, the number of windows per serie and the range `[lo, hi)` of the
+        positions with data, the windows are zero padded outside of it.
+        """
+        window_size = self.input_size + self.h
+        if step == "predict":
+            step_size = self.predict_step_size
+            # last input_size + test_size values, left padded if shorter
+            origin = n_time - self.input_size - self.test_size
+            lo, hi = max(origin, 0), n_time
+            padded_size = self.input_size + self.test_size
+            if (self.test_size == 0) and (len(self.futr_exog_list) == 0):
+                padded_size += self.h
+        elif step == "val":
+            step_size = self.step_size
+            lo = max(n_time - self.input_size - self.val_size - self.test_size, 0)
+            hi = n_time - self.test_size
+            pad_left = 0
+            if hi - lo < window_size:
+                pad_left = self.input_size - (hi - lo - self.val_size)
+            origin = lo - pad_left
+            padded_size = hi - lo + pad_left
+        else:
+            raise ValueError(f"Unknown step {step}")
+        if padded_size < window_size:
+            raise Exception(f"Time series is too short to create the {step} windows")
+        windows_per_serie = (padded_size - window_size) // step_size + 1
+        return origin, step_size, windows_per_serie, lo, hi
+
+    def _n_windows(self, batch, step):
+        """Number of 'predict' or 'val' windows of the `batch`."""
+        temporal = batch["temporal"]
+        _, _, windows_per_serie, _, _ = self._inference_windows_plan(
+            temporal.shape[-1], step
+        )
+        return len(temporal) * windows_per_serie
+
+    def _gather_windows(self, temporal, series, starts, lo, hi):
+        """[n, L+H, C] windows of `temporal` [B, C, T] that start at `starts` of `series`.
+
+        Positions outside of `[lo, hi)` are set to zero, like the padding of the series.
+        """
+        positions = starts[:, None] + torch.arange(
+            self.input_size + self.h, device=temporal.device
+        )
+        windows = temporal[series[:, None], :, positions.clamp(lo, hi - 1)]
+        windows[(positions < lo) | (positions >= hi)] = 0.0
+        return windows
+
     def _create_windows(self, batch, step, w_idxs=None):
         # Parse common data
         window_size = self.input_size + self.h
         temporal_cols = batch["temporal_cols"]
         temporal = batch["temporal"]
+        static = batch.get("static", None)
+        static_cols = batch.get("static_cols", None)
 
         if step == "train":
+            if self.train_sampling == "windows":
+                # Windows were already sampled and gathered by the loader
+                return dict(
+                    temporal=temporal,
+                    temporal_cols=temporal_cols,
+                    static=static,
+                    static_cols=static_cols,
+                )
+
             if self.val_size + self.test_size > 0:
                 cutoff = -self.val_size - self.test_size
                 temporal = temporal[:, :, :cutoff]
 
-            temporal = self.padder_train(temporal)
-            if temporal.shape[-1] < window_size:
+            # The windows unfold the series padded with `padder_train`
+            left_pad = self.input_size - 1 if self.start_padding_enabled else 0
+            padded_size = left_pad + temporal.shape[-1] + self.h
+            if padded_size < window_size:
                 raise Exception(
                     "Time series is too short for training, consider setting a smaller input size or set start_padding_enabled=True"
                 )
-            windows = temporal.unfold(
-                dimension=-1, size=window_size, step=self.step_size
+            windows_per_serie = (padded_size - window_size) // self.step_size + 1
+
+            # Sample and Available conditions, from the available mask alone
+            # [B, T + 1] number of available values before each position
+            available_idx = self._column_plan(
+                temporal_cols, static_cols, batch["y_idx"]
+            ).mask_idx
+            available = self.padder_train(temporal[:, available_idx, :]) > 0
+            counts = nn.functional.pad(torch.cumsum(available, dim=-1), (1, 0))
+            starts = (
+                torch.arange(windows_per_serie, device=temporal.device) * self.step_size
+            )
+            available_condition = (
+                counts[:, starts + self.input_size] - counts[:, starts]
             )
-
-            # [B, C, Ws, L+H] 0, 1, 2, 3
-            # -> [B * Ws, L+H, C] 0, 2, 3, 1
-            windows_per_serie = windows.shape[2]
-            windows = windows.permute(0, 2, 3, 1).contiguous()
-            windows = windows.reshape(-1, window_size, len(temporal_cols))
-
-            # Sample and Available conditions
-            available_idx = temporal_cols.get_loc("available_mask")
-            available_condition = windows[:, : self.input_size, available_idx]
-            available_condition = torch.sum(available_condition, axis=1)
             final_condition = available_condition > 0
             if self.h > 0:
-                sample_condition = windows[:, self.input_size :, available_idx]
-                sample_condition = torch.sum(sample_condition, axis=1)
-                final_condition = (sample_condition > 0) & (available_condition > 0)
-            windows = windows[final_condition]
-
-            # Parse Static data to match windows
-            # [B, S_in] -> [B, Ws, S_in] -> [B*Ws, S_in]
-            static = batch.get("static", None)
-            static_cols = batch.get("static_cols", None)
-            if static is not None:
-                static = torch.repeat_interleave(
-                    static, repeats=windows_per_serie, dim=0
+                sample_condition = (
+                    counts[:, starts + window_size]
+                    - counts[:, starts + self.input_size]
                 )
-                static = static[final_condition]
+                final_condition = (sample_condition > 0) & (available_condition > 0)
+            # [B * Ws] indices of the windows, in the same order as the unfolded windows
+            valid_idxs = torch.nonzero(final_condition.reshape(-1)).squeeze(-1)
 
             # Protection of empty windows
-            if final_condition.sum() == 0:
+            n_windows = len(valid_idxs)
+            if n_windows == 0:
                 raise Exception("No windows available for training")
 
             # Sample windows
-            n_windows = len(windows)
             if self.windows_batch_size is not None:
                 w_idxs = np.random.choice(
                     n_windows,
                     size=self.windows_batch_size,
                     replace=(n_windows < self.windows_batch_size),
                 )
-                windows = windows[w_idxs]
+                valid_idxs = valid_idxs[torch.from_numpy(w_idxs).to(valid_idxs.device)]
+
+            # Gather only the sampled windows [Ws, L+H, C]
+            series = valid_idxs // windows_per_serie
+            starts = (valid_idxs % windows_per_serie) * self.step_size - left_pad
+            windows = self._gather_windows(
+                temporal, series, starts, 0, temporal.shape[-1]
+            )
 
-                if static is not None:
-                    static = static[w_idxs]
+            # Parse Static data to match windows
+            if static is not None:
+                static = static[series]
 
-            # think about interaction available * sample mask
-            # [B, C, Ws, L+H]
             windows_batch = dict(
                 temporal=windows,
                 temporal_cols=temporal_cols,
@@ -209,64 +279,19 @@ class BaseWindows(BaseModel):
             return windows_batch
 
         elif step in ["predict", "val"]:
-
-            if step == "predict":
-                initial_input = temporal.shape[-1] - self.test_size
-                if (
-                    initial_input <= self.input_size
-                ):  # There is not enough data to predict first timestamp
-                    padder_left = nn.ConstantPad1d(
-                        padding=(self.input_size - initial_input, 0), value=0
-                    )
-                    temporal = padder_left(temporal)
-                predict_step_size = self.predict_step_size
-                cutoff = -self.input_size - self.test_size
-                temporal = temporal[:, :, cutoff:]
-
-            elif step == "val":
-                predict_step_size = self.step_size
-                cutoff = -self.input_size - self.val_size - self.test_size
-                if self.test_size > 0:
-                    temporal = batch["temporal"][:, :, cutoff : -self.test_size]
-                else:
-                    temporal = batch["temporal"][:, :, cutoff:]
-                if temporal.shape[-1] < window_size:
-                    initial_input = temporal.shape[-1] - self.val_size
-                    padder_left = nn.ConstantPad1d(
-                        padding=(self.input_size - initial_input, 0), value=0
-                    )
-                    temporal = padder_left(temporal)
-
-            if (
-                (step == "predict")
-                and (self.test_size == 0)
-                and (len(self.futr_exog_list) == 0)
-            ):
-                padder_right = nn.ConstantPad1d(padding=(0, self.h), value=0)
-                temporal = padder_right(temporal)
-
-            windows = temporal.unfold(
-                dimension=-1, size=window_size, step=predict_step_size
+            origin, step_size, windows_per_serie, lo, hi = self._inference_windows_plan(
+                temporal.shape[-1], step
             )
-
-            # [batch, channels, windows, window_size] 0, 1, 2, 3
-            # -> [batch * windows, window_size, channels] 0, 2, 3, 1
-            windows_per_serie = windows.shape[2]
-            windows = windows.permute(0, 2, 3, 1).contiguous()
-            windows = windows.reshape(-1, window_size, len(temporal_cols))
-
-            static = batch.get("static", None)
-            static_cols = batch.get("static_cols", None)
+            if w_idxs is None:
+                w_idxs = np.arange(len(temporal) * windows_per_serie)
+            w_idxs = torch.as_tensor(w_idxs, device=temporal.device)
+
+            # Gather only the requested windows [Ws, L+H, C]
+            series = w_idxs // windows_per_serie
+            starts = origin + (w_idxs % windows_per_serie) * step_size
+            windows = self._gather_windows(temporal, series, starts, lo, hi)
             if static is not None:
-                static = torch.repeat_interleave(
-                    static, repeats=windows_per_serie, dim=0
-                )
-
-            # Sample windows for batched prediction
-            if w_idxs is not None:
-                windows = windows[w_idxs]
-                if static is not None:
-                    static = static[w_idxs]
+                static = static[series]
 
             windows_batch = dict(
                 temporal=windows,
@@ -282,17 +307,14 @@ class BaseWindows(BaseModel):
         # windows are already filtered by train/validation/test
         # from the `create_windows_method` nor leakage risk
         temporal = windows["temporal"]  # B, L+H, C
-        temporal_cols = windows["temporal_cols"].copy()  # B, L+H, C
+        plan = self._column_plan(
+            windows["temporal_cols"], windows["static_cols"], y_idx
+        )
 
         # To avoid leakage uses only the lags
-        # temporal_data_cols = temporal_cols.drop('available_mask').tolist()
-        temporal_data_cols = self._get_temporal_exogenous_cols(
-            temporal_cols=temporal_cols
-        )
-        temporal_idxs = get_indexer_raise_missing(temporal_cols, temporal_data_cols)
-        temporal_idxs = np.append(y_idx, temporal_idxs)
+        temporal_idxs = plan.idxs("data", temporal.device)
         temporal_data = temporal[:, :, temporal_idxs]
-        temporal_mask = temporal[:, :, temporal_cols.get_loc("available_mask")].clone()
+        temporal_mask = temporal[:, :, plan.mask_idx].clone()
         if self.h > 0:
             temporal_mask[:, -self.h :] = 0.0
 
@@ -343,7 +365,10 @@ class BaseWindows(BaseModel):
     def _parse_windows(self, batch, windows):
         # Filter insample lags from outsample horizon
         y_idx = batch["y_idx"]
-        mask_idx = batch["temporal_cols"].get_loc("available_mask")
+        plan = self._column_plan(
+            windows["temporal_cols"], windows["static_cols"], y_idx
+        )
+        mask_idx = plan.mask_idx
 
         insample_y = windows["temporal"][:, : self.input_size, y_idx]
         insample_mask = windows["temporal"][:, : self.input_size, mask_idx]
@@ -360,21 +385,15 @@ class BaseWindows(BaseModel):
             outsample_mask = windows["temporal"][:, self.input_size :, mask_idx]
 
         if len(self.hist_exog_list):
-            hist_exog_idx = get_indexer_raise_missing(
-                windows["temporal_cols"], self.hist_exog_list
-            )
+            hist_exog_idx = plan.idxs("hist", windows["temporal"].device)
             hist_exog = windows["temporal"][:, : self.input_size, hist_exog_idx]
 
         if len(self.futr_exog_list):
-            futr_exog_idx = get_indexer_raise_missing(
-                windows["temporal_cols"], self.futr_exog_list
-            )
+            futr_exog_idx = plan.idxs("futr", windows["temporal"].device)
             futr_exog = windows["temporal"][:, :, futr_exog_idx]
 
         if len(self.stat_exog_list):
-            static_idx = get_indexer_raise_missing(
-                windows["static_cols"], self.stat_exog_list
-            )
+            static_idx = plan.idxs("stat", windows["static"].device)
             stat_exog = windows["static"][:, static_idx]
 
         # TODO: think a better way of removing insample_y features
@@ -488,9 +507,7 @@ class BaseWindows(BaseModel):
         if self.val_size == 0:
             return np.nan
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="val")
-        n_windows = len(windows["temporal"])
+        n_windows = self._n_windows(batch, step="val")
         y_idx = batch["y_idx"]
 
         # Number of windows in batch
@@ -559,11 +576,9 @@ class BaseWindows(BaseModel):
         self.validation_step_outputs.append(valid_loss)
         return valid_loss
 
-    def predict_step(self, batch, batch_idx):
-
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="predict")
-        n_windows = len(windows["temporal"])
+    def _predict_inputs(self, batch):
+        # Normalized inputs of the batch's windows, by chunks of inference_windows_batch_size
+        n_windows = self._n_windows(batch, step="predict")
         y_idx = batch["y_idx"]
 
         # Number of windows in batch
@@ -572,7 +587,6 @@ class BaseWindows(BaseModel):
             windows_batch_size = n_windows
         n_batches = int(np.ceil(n_windows / windows_batch_size))
 
-        y_hats = []
         for i in range(n_batches):
             # Create and normalize windows [Ws, L+H, C]
             w_idxs = np.arange(
@@ -593,42 +607,164 @@ class BaseWindows(BaseModel):
                 hist_exog=hist_exog,  # [Ws, L, X]
                 stat_exog=stat_exog,
             )  # [Ws, S]
+            yield windows_batch
 
-            # Model Predictions
-            output_batch = self(windows_batch)
-            # Inverse normalization and sampling
-            if self.loss.is_distribution_output:
-                _, y_loc, y_scale = self._inv_normalization(
-                    y_hat=torch.empty(
-                        size=(insample_y.shape[0], self.h),
-                        dtype=output_batch[0].dtype,
-                        device=output_batch[0].device,
-                    ),
-                    temporal_cols=batch["temporal_cols"],
-                    y_idx=y_idx,
-                )
-                distr_args = self.loss.scale_decouple(
-                    output=output_batch, loc=y_loc, scale=y_scale
-                )
-                _, sample_mean, quants = self.loss.sample(distr_args=distr_args)
-                y_hat = torch.concat((sample_mean, quants), axis=2)
-
-                if self.loss.return_params:
-                    distr_args = torch.stack(distr_args, dim=-1)
-                    distr_args = torch.reshape(
-                        distr_args, (len(windows["temporal"]), self.h, -1)
-                    )
-                    y_hat = torch.concat((y_hat, distr_args), axis=2)
-            else:
-                y_hat, _, _ = self._inv_normalization(
-                    y_hat=output_batch,
-                    temporal_cols=batch["temporal_cols"],
-                    y_idx=y_idx,
-                )
-            y_hats.append(y_hat)
+    def _predict_output(self, batch, windows_batch):
+        # Model Predictions
+        y_idx = batch["y_idx"]
+        insample_y = windows_batch["insample_y"]
+        output_batch = self(windows_batch)
+        # Inverse normalization and sampling
+        if self.loss.is_distribution_output:
+            _, y_loc, y_scale = self._inv_normalization(
+                y_hat=torch.empty(
+                    size=(insample_y.shape[0], self.h),
+                    dtype=output_batch[0].dtype,
+                    device=output_batch[0].device,
+                ),
+                temporal_cols=batch["temporal_cols"],
+                y_idx=y_idx,
+            )
+            distr_args = self.loss.scale_decouple(
+                output=output_batch, loc=y_loc, scale=y_scale
+            )
+            _, sample_mean, quants = self.loss.sample(distr_args=distr_args)
+            y_hat = torch.concat((sample_mean, quants), axis=2)
+
+            if self.loss.return_params:
+                distr_args = torch.stack(distr_args, dim=-1)
+                distr_args = torch.reshape(distr_args, (len(insample_y), self.h, -1))
+                y_hat = torch.concat((y_hat, distr_args), axis=2)
+        else:
+            y_hat, _, _ = self._inv_normalization(
+                y_hat=output_batch, temporal_cols=batch["temporal_cols"], y_idx=y_idx
+            )
+        return y_hat
+
+    def predict_step(self, batch, batch_idx):
+        y_hats = [
+            self._predict_output(batch, windows_batch)
+            for windows_batch in self._predict_inputs(batch)
+        ]
         y_hat = torch.cat(y_hats, dim=0)
         return y_hat
 
+    def _inference_lookback(self):
+        # The predicted windows only read the last `input_size` timestamps
+        return self.input_size
+
+    def _shared_windows_key(self):
+        # Models with the same key build the same prediction windows and normalization.
+        # Sampled outputs depend on the seed of each model and revin on its parameters.
+        # The shared loop skips the PL Trainer, so only models predicted without it share them.
+        overridden = any(
+            getattr(type(self), method) is not getattr(BaseWindows, method)
+            for method in [
+                "predict_step",
+                "_predict_inputs",
+                "_create_windows",
+                "_normalization",
+                "_parse_windows",
+            ]
+        )
+        precision = self.trainer_kwargs.get("precision", None)
+        if (
+            overridden
+            or self.inference_engine != "torch"
+            or self.loss.is_distribution_output
+            or self.scaler.scaler_type == "revin"
+            or precision not in (None, 32, "32", "32-true")
+        ):
+            return None
+        return (
+            BaseWindows,
+            self.h,
+            self.input_size,
+            self.scaler.scaler_type,
+            tuple(self.hist_exog_list),
+            tuple(self.futr_exog_list),
+            tuple(self.stat_exog_list),
+            self.start_padding_enabled,
+            self.exclude_insample_y,
+            self.inference_windows_batch_size,
+            self.valid_batch_size,
+            self.test_size,
+            self._inference_device(self.trainer_kwargs),
+        )
+
+    @staticmethod
+    def _predict_shared(
+        models, dataset, step_size=1, random_seed=None, **data_module_kwargs
+    ):
+        """Predictions of `models` with the same `_shared_windows_key`.
+
+        The windows and their normalization are built once per batch by the first
+        model and fed to every model, in a plain loop under `torch.inference_mode`.
+        """
+        leader = models[0]
+        # The quantile of IQLoss is set on each model, it doesn't change the windows
+        shared_data_module_kwargs = {
+            k: v for k, v in data_module_kwargs.items() if k != "quantile"
+        }
+        for model in models:
+            model._check_exog(dataset)
+            model._restart_seed(random_seed)
+            model._set_quantile_for_iqloss(**data_module_kwargs)
+            model.predict_step_size = step_size
+            model.decompose_forecast = False
+        datamodule = TimeSeriesDataModule(
+            dataset=dataset,
+            valid_batch_size=leader.valid_batch_size,
+            **shared_data_module_kwargs,
+        )
+
+        device = leader._inference_device(leader.trainer_kwargs)
+        states = []
+        for model in models:
+            param = next(model.parameters(), None)
+            states.append(
+                (
+                    param.device if param is not None else torch.device("cpu"),
+                    model.training,
+                )
+            )
+            model.to(device)
+            model.eval()
+        fcsts = [[] for _ in models]
+        try:
+            with torch.inference_mode():
+                for batch in datamodule.predict_dataloader():
+                    batch = {
+                        k: (
+                            v.to(device, non_blocking=True)
+                            if isinstance(v, torch.Tensor)
+                            else v
+                        )
+                        for k, v in batch.items()
+                    }
+                    y_hats = [[] for _ in models]
+                    for windows_batch in leader._predict_inputs(batch):
+                        for model, model_y_hats in zip(models, y_hats):
+                            # the inverse normalization reads the statistics from the model's scaler
+                            model.scaler.x_shift = leader.scaler.x_shift
+                            model.scaler.x_scale = leader.scaler.x_scale
+                            model_y_hats.append(
+                                model._predict_output(batch, dict(windows_batch))
+                            )
+                    for model_fcsts, model_y_hats in zip(fcsts, y_hats):
+                        model_fcsts.append(torch.cat(model_y_hats, dim=0).cpu())
+        finally:
+            for model, (original_device, was_training) in zip(models, states):
+                model.to(original_device)
+                model.train(was_training)
+        return [
+            torch.vstack(model_fcsts)
+            .numpy()
+            .flatten()
+            .reshape(-1, len(model.loss.output_names))
+            for model, model_fcsts in zip(models, fcsts)
+        ]
+
     def fit(
         self,
         dataset,
@@ -658,14 +794,31 @@ class BaseWindows(BaseModel):
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
         `test_size`: int, test size for temporal cross-validation.<br>
         """
+        batch_size = self.batch_size
+        data_module_kwargs = {}
+        if self.train_sampling == "windows":
+            # Sample windows_batch_size windows from the whole dataset per step
+            if self.windows_batch_size is None:
+                raise ValueError(
+                    'windows_batch_size must be set when train_sampling="windows"'
+                )
+            batch_size = self.windows_batch_size
+            data_module_kwargs["windows_kwargs"] = dict(
+                input_size=self.input_size,
+                h=self.h,
+                step_size=self.step_size,
+                cutoff=val_size + test_size,
+                start_padding_enabled=self.start_padding_enabled,
+            )
         return self._fit(
             dataset=dataset,
-            batch_size=self.batch_size,
+            batch_size=batch_size,
             valid_batch_size=self.valid_batch_size,
             val_size=val_size,
             test_size=test_size,
             random_seed=random_seed,
             distributed_config=distributed_config,
+            **data_module_kwargs,
         )
 
     def predict(
@@ -678,7 +831,8 @@ class BaseWindows(BaseModel):
     ):
         """Predict.
 
-        Neural network prediction with PL's `Trainer` execution of `predict_step`.
+        Neural network prediction with PL's `Trainer` execution of `predict_step`,
+        or a plain torch loop when the model's `inference_engine='torch'`.
 
         **Parameters:**<br>
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
@@ -706,8 +860,7 @@ class BaseWindows(BaseModel):
         ):
             pred_trainer_kwargs["devices"] = [0]
 
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-        fcsts = trainer.predict(self, datamodule=datamodule)
+        fcsts = self._predict_batches(datamodule, pred_trainer_kwargs)
         fcsts = torch.vstack(fcsts).numpy().flatten()
         fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
@@ -4,10 +4,12 @@
 __all__ = ['NeuralForecast']
 
 # %% ../nbs/core.ipynb 4
+import hashlib
 import os
 import pickle
 import warnings
-from copy import deepcopy
+from collections import OrderedDict
+from copy import copy, deepcopy
 from itertools import chain
 from typing import Any, Dict, List, Optional, Union
 
@@ -27,9 +29,16 @@ from coreforecast.scalers import (
 from utilsforecast.compat import DataFrame, Series, pl_DataFrame, pl_Series
 from utilsforecast.validation import validate_freq
 
-from .common._base_model import DistributedConfig
+from .common._base_model import BaseModel, DistributedConfig
 from .compat import SparkDataFrame
-from .tsdataset import _FilesDataset, TimeSeriesDataset
+from neuralforecast.tsdataset import (
+    _FilesDataset,
+    _HistoryBuffer,
+    _ranges_idxs,
+    _SeriesBuffer,
+    _TailBuffer,
+    TimeSeriesDataset,
+)
 from neuralforecast.models import (
     GRU,
     LSTM,
@@ -120,7 +129,44 @@ def _insample_times(
     out = ufp.assign_columns(out, "cutoff", actual_cutoffs)
     return out
 
-# %% ../nbs/core.ipynb 7
+
+def _tail_by_id(
+    df: DataFrame,
+    n: int,
+    id_col: str = "unique_id",
+    time_col: str = "ds",
+) -> DataFrame:
+    """Last `n` rows of each serie, sorted by id and time."""
+    # The series are sliced by position, which requires them sorted like their counts
+    sort_idxs = ufp.maybe_compute_sort_indices(df, id_col, time_col)
+    if sort_idxs is not None:
+        df = ufp.take_rows(df, sort_idxs)
+    sizes = ufp.counts_by_id(df, id_col)["counts"].to_numpy()
+    if (sizes <= n).all():
+        return df
+    ends = sizes.cumsum()
+    tail_sizes = np.minimum(sizes, n)
+    return ufp.take_rows(df, _ranges_idxs(ends - tail_sizes, tail_sizes))
+
+
+def _exog_tensor(x, n_rows: int, cols: List[str], name: str) -> torch.Tensor:
+    """Exogenous features of `predict_arrays` as a float32 tensor of shape [n_rows, len(cols)]."""
+    if not cols:
+        return torch.empty((n_rows, 0), dtype=torch.float32)
+    if x is None:
+        raise ValueError(
+            f"Models require the following features through `{name}`: {cols}."
+        )
+    x = torch.as_tensor(x, dtype=torch.float32)
+    if x.ndim == 1 and len(cols) == 1:
+        x = x.reshape(-1, 1)
+    if x.shape != (n_rows, len(cols)):
+        raise ValueError(
+            f"`{name}` must have shape ({n_rows}, {len(cols)}), got {tuple(x.shape)}."
+        )
+    return x
+
+# %% ../nbs/core.ipynb 8
 MODEL_FILENAME_DICT = {
     "autoformer": Autoformer,
     "autoautoformer": Autoformer,
@@ -181,7 +227,7 @@ MODEL_FILENAME_DICT = {
     "autosofts": SOFTS,
 }
 
-# %% ../nbs/core.ipynb 8
+# %% ../nbs/core.ipynb 9
 _type2scaler = {
     "standard": LocalStandardScaler,
     "robust": lambda: LocalRobustScaler(scale="mad"),
@@ -190,7 +236,7 @@ _type2scaler = {
     "boxcox": lambda: LocalBoxCoxScaler(method="loglik", lower=0.0),
 }
 
-# %% ../nbs/core.ipynb 9
+# %% ../nbs/core.ipynb 10
 def _id_as_idx() -> bool:
     return not bool(os.getenv("NIXTLA_ID_AS_COL", ""))
 
@@ -203,7 +249,48 @@ def _warn_id_as_idx():
         category=FutureWarning,
     )
 
-# %% ../nbs/core.ipynb 10
+
+class _ForecastCache:
+    """LRU cache of the forecasts of each serie, keyed by a fingerprint of its inputs."""
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("`predict_cache_size` must be at least 1.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: np.ndarray) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "max_size": self.max_size,
+        }
+
+# %% ../nbs/core.ipynb 11
 class NeuralForecast:
 
     def __init__(
@@ -211,6 +298,9 @@ class NeuralForecast:
         models: List[Any],
         freq: Union[str, int],
         local_scaler_type: Optional[str] = None,
+        temporal_dtypes: Optional[Dict[str, str]] = None,
+        inference_engine: Optional[str] = None,
+        predict_cache_size: Optional[int] = None,
     ):
         """
         The `core.StatsForecast` class allows you to efficiently fit multiple `NeuralForecast` models
@@ -228,6 +318,17 @@ class NeuralForecast:
         local_scaler_type : str, optional (default=None)
             Scaler to apply per-serie to all features before fitting, which is inverted after predicting.
             Can be 'standard', 'robust', 'robust-iqr', 'minmax' or 'boxcox'
+        temporal_dtypes : dict, optional (default=None)
+            Storage dtype of the temporal columns of the datasets, by column name. Can be 'float32',
+            'float16', 'bfloat16', 'int16', 'int8' or 'uint8', columns not in the dict are stored as float32.
+            The values are cast back to float32 when the batches are built.
+        inference_engine : str, optional (default=None)
+            Engine the models use to predict, overrides the models' `inference_engine`. 'lightning' runs
+            the models' `predict_step` through a PL Trainer, 'torch' in a plain loop under `torch.inference_mode`.
+        predict_cache_size : int, optional (default=None)
+            Number of series whose forecasts `predict` keeps in a LRU cache. The key of each serie hashes
+            the rows the models read, including its future exogenous, its static features and the models'
+            weights, so only the series whose inputs changed are predicted again. Disabled if None.
 
         Returns
         -------
@@ -244,45 +345,94 @@ class NeuralForecast:
         if local_scaler_type is not None and local_scaler_type not in _type2scaler:
             raise ValueError(f"scaler_type must be one of {_type2scaler.keys()}")
         self.local_scaler_type = local_scaler_type
+        self.temporal_dtypes = temporal_dtypes
+        if inference_engine is not None and inference_engine not in (
+            "lightning",
+            "torch",
+        ):
+            raise ValueError(
+                f"inference_engine must be 'lightning' or 'torch', got {inference_engine}"
+            )
+        self.inference_engine = inference_engine
+        self.predict_cache_size = predict_cache_size
+        self._predict_cache = (
+            None if predict_cache_size is None else _ForecastCache(predict_cache_size)
+        )
+        self._weights_fingerprint: Optional[bytes] = None
         self.scalers_: Dict
 
         # Flags and attributes
         self._fitted = False
         self._reset_models()
+        # Buffer of the observations added by `update`, see `_reset_updates`
+        self._tail_buffer: Optional[_SeriesBuffer] = None
+        self._tail_last_dates: Optional[np.ndarray] = None
+        self._uids_index: Optional[pd.Index] = None
 
     def _scalers_fit_transform(self, dataset: TimeSeriesDataset) -> None:
         self.scalers_ = {}
         if self.local_scaler_type is None:
             return None
-        for i, col in enumerate(dataset.temporal_cols):
+        temporal_dtypes = dataset.temporal_dtypes or ["float32"] * len(
+            dataset.temporal_cols
+        )
+        for i, (col, dtype) in enumerate(zip(dataset.temporal_cols, temporal_dtypes)):
             if col == "available_mask":
                 continue
-            ga = GroupedArray(dataset.temporal[:, i].numpy(), dataset.indptr)
+            if "float" not in dtype:
+                raise ValueError(
+                    f"`{col}` is stored as {dtype} and `local_scaler_type` scales every column, use a float dtype."
+                )
+            ga = GroupedArray(dataset._temporal_column(i).numpy(), dataset.indptr)
             self.scalers_[col] = _type2scaler[self.local_scaler_type]().fit(ga)
-            dataset.temporal[:, i] = torch.from_numpy(self.scalers_[col].transform(ga))
+            dataset._set_temporal_column(
+                i, torch.from_numpy(self.scalers_[col].transform(ga))
+            )
 
-    def _scalers_transform(self, dataset: TimeSeriesDataset) -> None:
+    def _scalers_transform(
+        self, dataset: TimeSeriesDataset, groups: Optional[np.ndarray] = None
+    ) -> None:
         if not self.scalers_:
             return None
         for i, col in enumerate(dataset.temporal_cols):
             scaler = self.scalers_.get(col, None)
             if scaler is None:
                 continue
-            ga = GroupedArray(dataset.temporal[:, i].numpy(), dataset.indptr)
-            dataset.temporal[:, i] = torch.from_numpy(scaler.transform(ga))
+            scaler = self._select_scaler(scaler, groups)
+            ga = GroupedArray(dataset._temporal_column(i).numpy(), dataset.indptr)
+            dataset._set_temporal_column(i, torch.from_numpy(scaler.transform(ga)))
 
     def _scalers_target_inverse_transform(
-        self, data: np.ndarray, indptr: np.ndarray
+        self, data: np.ndarray, indptr: np.ndarray, groups: Optional[np.ndarray] = None
     ) -> np.ndarray:
         if not self.scalers_:
             return data
+        scaler = self._select_scaler(self.scalers_[self.target_col], groups)
         for i in range(data.shape[1]):
             ga = GroupedArray(data[:, i], indptr)
-            data[:, i] = self.scalers_[self.target_col].inverse_transform(ga)
+            data[:, i] = scaler.inverse_transform(ga)
         return data
 
+    @staticmethod
+    def _select_scaler(scaler, groups: Optional[np.ndarray]):
+        # Fitted scaler with the statistics of the stored series at positions `groups`,
+        # which can be in any order and repeat. The scaler itself if None
+        if groups is None:
+            return scaler
+        selected = copy(scaler)
+        selected.stats_ = scaler.stats_[groups]
+        return selected
+
     def _prepare_fit(
-        self, df, static_df, sort_df, predict_only, id_col, time_col, target_col
+        self,
+        df,
+        static_df,
+        sort_df,
+        predict_only,
+        id_col,
+        time_col,
+        target_col,
+        groups=None,
     ):
         # TODO: uids, last_dates and ds should be properties of the dataset class. See github issue.
         self.id_col = id_col
@@ -297,13 +447,48 @@ class NeuralForecast:
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
+            exog_cols=self._get_needed_exog(),
+            temporal_dtypes=self.temporal_dtypes,
         )
         if predict_only:
-            self._scalers_transform(dataset)
+            self._scalers_transform(dataset, groups)
         else:
             self._scalers_fit_transform(dataset)
         return dataset, uids, last_dates, ds
 
+    def _prepare_fit_dataset(
+        self, dataset, predict_only, id_col, time_col, target_col, lookback=None
+    ):
+        missing = [
+            attr
+            for attr in ("uids", "last_dates", "ds")
+            if getattr(dataset, attr, None) is None
+        ]
+        if missing:
+            raise ValueError(
+                f"The dataset is missing {missing}. Store it with "
+                "`TimeSeriesDataset.save(path, uids, last_dates, ds)` and restore it with "
+                "`TimeSeriesDataset.load(path)` to use it directly."
+            )
+        if dataset.temporal_cols[dataset.y_idx] != target_col:
+            raise ValueError(
+                f"The dataset target is `{dataset.temporal_cols[dataset.y_idx]}`, got `target_col={target_col}`."
+            )
+        self.id_col = id_col
+        self.time_col = time_col
+        self.target_col = target_col
+
+        # Only the last `lookback` timestamps of each serie are kept, `tail` copies them
+        scaled = dataset if lookback is None else dataset.tail(lookback)
+        # Scalers work inplace, protect the (possibly memory-mapped) input arrays
+        if self.local_scaler_type is not None and scaled is dataset:
+            scaled = dataset._writable_copy()
+        if predict_only:
+            self._scalers_transform(scaled)
+        else:
+            self._scalers_fit_transform(scaled)
+        return scaled, dataset.uids, dataset.last_dates, dataset.ds
+
     def _check_nan(self, df, static_df, id_col, time_col, target_col):
         cols_with_nans = []
 
@@ -312,10 +497,9 @@ class NeuralForecast:
         ]
         if "available_mask" in temporal_cols:
             available_mask = df["available_mask"].to_numpy().astype(bool)
+            df_to_check = ufp.filter_with_mask(df, available_mask)
         else:
-            available_mask = np.full(df.shape[0], True)
-
-        df_to_check = ufp.filter_with_mask(df, available_mask)
+            df_to_check = df
         for col in temporal_cols:
             if ufp.is_nan_or_none(df_to_check[col]).any():
                 cols_with_nans.append(col)
@@ -382,7 +566,7 @@ class NeuralForecast:
 
     def fit(
         self,
-        df: Optional[Union[DataFrame, SparkDataFrame]] = None,
+        df: Optional[Union[DataFrame, SparkDataFrame, TimeSeriesDataset]] = None,
         static_df: Optional[Union[DataFrame, SparkDataFrame]] = None,
         val_size: Optional[int] = 0,
         sort_df: bool = True,
@@ -392,6 +576,7 @@ class NeuralForecast:
         time_col: str = "ds",
         target_col: str = "y",
         distributed_config: Optional[DistributedConfig] = None,
+        shared_memory: bool = False,
     ) -> None:
         """Fit the core.NeuralForecast.
 
@@ -400,8 +585,9 @@ class NeuralForecast:
 
         Parameters
         ----------
-        df : pandas, polars or spark DataFrame, optional (default=None)
+        df : pandas, polars or spark DataFrame, or TimeSeriesDataset, optional (default=None)
             DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
+            Can also be a `TimeSeriesDataset` restored with `TimeSeriesDataset.load`, which is used without copies.
             If None, a previously stored dataset is required.
         static_df : pandas, polars or spark DataFrame, optional (default=None)
             DataFrame with columns [`unique_id`] and static exogenous.
@@ -421,6 +607,9 @@ class NeuralForecast:
             Column that contains the target.
         distributed_config : neuralforecast.DistributedConfig
             Configuration to use for DDP training. Currently only spark is supported.
+        shared_memory : bool (default=False)
+            Move the dataset into shared memory, so the DataLoader workers (`num_workers_loader>0`)
+            and the Ray trials of the auto models on this host use it without copies.
 
         Returns
         -------
@@ -450,6 +639,17 @@ class NeuralForecast:
                 target_col=target_col,
             )
             self.sort_df = sort_df
+        elif isinstance(df, TimeSeriesDataset):
+            self.dataset, self.uids, self.last_dates, self.ds = (
+                self._prepare_fit_dataset(
+                    dataset=df,
+                    predict_only=False,
+                    id_col=id_col,
+                    time_col=time_col,
+                    target_col=target_col,
+                )
+            )
+            self.sort_df = df.sorted
         elif isinstance(df, SparkDataFrame):
             if static_df is not None and not isinstance(static_df, SparkDataFrame):
                 raise ValueError(
@@ -469,9 +669,14 @@ class NeuralForecast:
                 print("Using stored dataset.")
         else:
             raise ValueError(
-                f"`df` must be a pandas, polars or spark DataFrame or `None`, got: {type(df)}"
+                f"`df` must be a pandas, polars or spark DataFrame, a TimeSeriesDataset or `None`, got: {type(df)}"
             )
 
+        if df is not None:
+            self._reset_updates()
+        if shared_memory and isinstance(self.dataset, TimeSeriesDataset):
+            self.dataset.share_memory()
+
         if val_size is not None:
             if self.dataset.min_size < val_size:
                 warnings.warn(
@@ -488,6 +693,7 @@ class NeuralForecast:
             )
 
         self._fitted = True
+        self.clear_predict_cache()
 
     def make_future_dataframe(self, df: Optional[DataFrame] = None) -> DataFrame:
         """Create a dataframe with all ids and future times in the forecasting horizon.
@@ -512,7 +718,7 @@ class NeuralForecast:
             last_times = last_times_by_id[self.time_col]
         else:
             uids = self.uids
-            last_times = self.last_dates
+            last_times = self._stored_last_dates()
         return ufp.make_future_dataframe(
             uids=uids,
             last_times=last_times,
@@ -544,6 +750,19 @@ class NeuralForecast:
             chain.from_iterable(getattr(m, "futr_exog_list", []) for m in self.models)
         )
 
+    def _get_needed_exog(self):
+        # Auto models only know their exogenous features once fitted, keep every column
+        if not all(
+            hasattr(m, "hist_exog_list") and hasattr(m, "futr_exog_list")
+            for m in self.models
+        ):
+            return None
+        return set(
+            chain.from_iterable(
+                m.hist_exog_list + m.futr_exog_list for m in self.models
+            )
+        )
+
     def _get_model_names(self) -> List[str]:
         names: List[str] = []
         count_names = {"model": 0}
@@ -672,12 +891,13 @@ class NeuralForecast:
 
     def predict(
         self,
-        df: Optional[Union[DataFrame, SparkDataFrame]] = None,
+        df: Optional[Union[DataFrame, SparkDataFrame, TimeSeriesDataset]] = None,
         static_df: Optional[Union[DataFrame, SparkDataFrame]] = None,
         futr_df: Optional[Union[DataFrame, SparkDataFrame]] = None,
         sort_df: bool = True,
         verbose: bool = False,
         engine=None,
+        ids=None,
         **data_kwargs,
     ):
         """Predict with core.NeuralForecast.
@@ -686,9 +906,10 @@ class NeuralForecast:
 
         Parameters
         ----------
-        df : pandas, polars or spark DataFrame, optional (default=None)
+        df : pandas, polars or spark DataFrame, or TimeSeriesDataset, optional (default=None)
             DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
             If a DataFrame is passed, it is used to generate forecasts.
+            Can also be a `TimeSeriesDataset` restored with `TimeSeriesDataset.load`.
         static_df : pandas, polars or spark DataFrame, optional (default=None)
             DataFrame with columns [`unique_id`] and static exogenous.
         futr_df : pandas, polars or spark DataFrame, optional (default=None)
@@ -699,6 +920,8 @@ class NeuralForecast:
             Print processing steps.
         engine : spark session
             Distributed engine for inference. Only used if df is a spark dataframe or if fit was called on a spark dataframe.
+        ids : list-like, optional (default=None)
+            Ids of the stored series to predict, only used without `df`. Defaults to all the stored series.
         data_kwargs : kwargs
             Extra arguments to be passed to the dataset within each model.
 
@@ -714,6 +937,34 @@ class NeuralForecast:
         if not self._fitted:
             raise Exception("You must fit the model before predicting.")
 
+        self._check_futr_exog(futr_df)
+
+        # distributed df or NeuralForecast instance was trained with a distributed input and no df is provided
+        # we assume the user wants to perform distributed inference as well
+        is_files_dataset = isinstance(getattr(self, "dataset", None), _FilesDataset)
+        if ids is not None and (df is not None or is_files_dataset):
+            raise ValueError(
+                "`ids` can only be used to predict the series of a stored local dataset, without `df`."
+            )
+        if isinstance(df, SparkDataFrame) or (df is None and is_files_dataset):
+            return self._predict_distributed(
+                df=df,
+                static_df=static_df,
+                futr_df=futr_df,
+                engine=engine,
+            )
+
+        return self._predict_local(
+            df=df,
+            static_df=static_df,
+            futr_df=futr_df,
+            sort_df=sort_df,
+            verbose=verbose,
+            ids=ids,
+            **data_kwargs,
+        )
+
+    def _check_futr_exog(self, futr_df):
         needed_futr_exog = self._get_needed_futr_exog()
         if needed_futr_exog:
             if futr_df is None:
@@ -728,19 +979,41 @@ class NeuralForecast:
                         f"The following features are missing from `futr_df`: {missing}"
                     )
 
-        # distributed df or NeuralForecast instance was trained with a distributed input and no df is provided
-        # we assume the user wants to perform distributed inference as well
-        is_files_dataset = isinstance(getattr(self, "dataset", None), _FilesDataset)
-        if isinstance(df, SparkDataFrame) or (df is None and is_files_dataset):
-            return self._predict_distributed(
-                df=df,
-                static_df=static_df,
-                futr_df=futr_df,
-                engine=engine,
-            )
+    def _predict_local(
+        self,
+        df,
+        static_df,
+        futr_df,
+        sort_df=True,
+        verbose=False,
+        ids=None,
+        groups=None,
+        **data_kwargs,
+    ):
+        # Forecasts of a local `df`, or of the stored series without it. `groups` are the
+        # positions among the stored series of the sorted series of `df`, whose scaler
+        # statistics are applied to them. Without them the series are scaled by position
+        needed_futr_exog = self._get_needed_futr_exog()
 
         # Process new dataset but does not store it.
-        if df is not None:
+        # Only the last `lookback` timestamps of each serie are used by the models
+        lookback = self._inference_lookback()
+        # Stored series only grow through `update`, recurrent models can resume them
+        state_keys = None
+        if isinstance(df, TimeSeriesDataset):
+            dataset, uids, last_dates, _ = self._prepare_fit_dataset(
+                dataset=df,
+                predict_only=True,
+                id_col=self.id_col,
+                time_col=self.time_col,
+                target_col=self.target_col,
+                lookback=lookback,
+            )
+        elif df is not None:
+            if lookback is not None:
+                df = _tail_by_id(
+                    df, lookback, id_col=self.id_col, time_col=self.time_col
+                )
             validate_freq(df[self.time_col], self.freq)
             dataset, uids, last_dates, _ = self._prepare_fit(
                 df=df,
@@ -750,16 +1023,29 @@ class NeuralForecast:
                 id_col=self.id_col,
                 time_col=self.time_col,
                 target_col=self.target_col,
+                groups=groups,
             )
+        elif self._tail_buffer is not None:
+            # Tails of the stored series kept up to date by `update`
+            groups = None if ids is None else self._ids_positions(ids)
+            dataset = self._tail_buffer.to_dataset(groups)
+            uids, last_dates = self._stored_series(groups)
+            state_keys = list(uids)
+            if verbose:
+                print("Using updated stored dataset.")
         else:
             dataset = self.dataset
-            uids = self.uids
-            last_dates = self.last_dates
+            if ids is not None:
+                # Only the requested series are sliced and predicted
+                groups = self._ids_positions(ids)
+                dataset = dataset.select(groups)
+            if lookback is not None:
+                dataset = dataset.tail(lookback)
+            uids, last_dates = self._stored_series(groups)
+            state_keys = list(uids)
             if verbose:
                 print("Using stored dataset.")
 
-        cols = self._get_model_names()
-
         # Placeholder dataframe for predictions with unique_id and ds
         fcsts_df = ufp.make_future_dataframe(
             uids=uids,
@@ -799,25 +1085,16 @@ class NeuralForecast:
             time_col=self.time_col,
             target_col=self.target_col,
         )
-        self._scalers_transform(futr_dataset)
+        self._scalers_transform(futr_dataset, groups)
         dataset = dataset.append(futr_dataset)
 
-        col_idx = 0
-        fcsts = np.full(
-            (self.h * len(uids), len(cols)), fill_value=np.nan, dtype=np.float32
+        fcsts = self._predict_future(
+            dataset,
+            n_series=len(uids),
+            state_keys=state_keys,
+            groups=groups,
+            **data_kwargs,
         )
-        for model in self.models:
-            old_test_size = model.get_test_size()
-            model.set_test_size(self.h)  # To predict h steps ahead
-            model_fcsts = model.predict(dataset=dataset, **data_kwargs)
-            # Append predictions in memory placeholder
-            output_length = len(model.loss.output_names)
-            fcsts[:, col_idx : col_idx + output_length] = model_fcsts
-            col_idx += output_length
-            model.set_test_size(old_test_size)  # Set back to original value
-        if self.scalers_:
-            indptr = np.append(0, np.full(len(uids), self.h).cumsum())
-            fcsts = self._scalers_target_inverse_transform(fcsts, indptr)
 
         # Declare predictions pd.DataFrame
         cols = (
@@ -833,8 +1110,432 @@ class NeuralForecast:
             fcsts_df = fcsts_df.set_index(self.id_col)
         return fcsts_df
 
+    def update(self, df: DataFrame) -> None:
+        """Update core.NeuralForecast with new observations of the stored series.
+
+        The last timestamps of each serie that the models read are kept in a buffer, which
+        `predict` uses when no `df` is passed. Each call only processes the new rows, scaled
+        with the fitted `local_scaler_type` statistics. Fitting on a new `df` discards the updates.
+
+        Parameters
+        ----------
+        df : pandas or polars DataFrame
+            DataFrame with columns [`unique_id`, `ds`, `y`] and the exogenous variables of the
+            stored dataset, with observations after the last ones of each serie.
+        """
+        if not self._fitted:
+            raise Exception("You must fit the model before updating it.")
+        if not isinstance(getattr(self, "dataset", None), TimeSeriesDataset):
+            raise Exception("You must have a stored dataset to update it.")
+        temporal_cols = self.dataset.temporal_cols
+        missing = [
+            col
+            for col in temporal_cols
+            if col != "available_mask" and col not in df.columns
+        ]
+        if missing:
+            raise ValueError(f"The following columns are missing from `df`: {missing}")
+        self._check_nan(df, None, self.id_col, self.time_col, self.target_col)
+        if "available_mask" not in df.columns:
+            df = ufp.copy_if_pandas(df, deep=False)
+            df = ufp.assign_columns(df, "available_mask", 1.0)
+        temporal_dtypes = self.dataset.temporal_dtypes or ["float32"] * len(
+            temporal_cols
+        )
+        new_dataset, uids, last_dates, ds = TimeSeriesDataset.from_df(
+            df=df[[self.id_col, self.time_col, *temporal_cols]],
+            sort_df=True,
+            id_col=self.id_col,
+            time_col=self.time_col,
+            target_col=self.target_col,
+            temporal_dtypes=dict(zip(temporal_cols, temporal_dtypes)),
+        )
+
+        if self._tail_buffer is None or self._tail_last_dates is None:
+            # Only the last timestamps read by the models are kept, if they're bounded
+            lookback = self._inference_lookback()
+            if lookback is None:
+                self._tail_buffer = _HistoryBuffer(self.dataset)
+            else:
+                self._tail_buffer = _TailBuffer(self.dataset, lookback)
+            self._tail_last_dates = np.array(self.last_dates)
+        groups = self._uid_positions(uids)
+        if (groups < 0).any():
+            raise ValueError(
+                f"`df` contains series that aren't stored: {np.asarray(uids)[groups < 0].tolist()}"
+            )
+        if (ds[new_dataset.indptr[:-1]] <= self._tail_last_dates[groups]).any():
+            raise ValueError(
+                "`df` must only contain observations after the last ones of each serie."
+            )
+        # Each row must follow the previous one of its serie by `freq`
+        prev_dates = np.empty_like(ds)
+        prev_dates[1:] = ds[:-1]
+        prev_dates[new_dataset.indptr[:-1]] = self._tail_last_dates[groups]
+        prev_dates = (
+            pl_Series(prev_dates)
+            if isinstance(df, pl_DataFrame)
+            else pd.Index(prev_dates)
+        )
+        if (np.asarray(ufp.offset_times(prev_dates, self.freq, 1)) != ds).any():
+            raise ValueError(
+                f"`df` must continue each serie without gaps, with observations every `freq={self.freq}`."
+            )
+
+        # Rows in the order of the stored series, to be scaled with their statistics
+        order = np.argsort(groups, kind="stable")
+        groups = groups[order]
+        sizes = np.diff(new_dataset.indptr)[order]
+        rows = _ranges_idxs(new_dataset.indptr[:-1][order], sizes)
+        counts = np.zeros(self.dataset.n_groups, dtype=np.int64)
+        counts[groups] = sizes
+        new_dataset = TimeSeriesDataset(
+            temporal=new_dataset.temporal[torch.from_numpy(rows)],
+            temporal_cols=new_dataset.temporal_cols,
+            indptr=np.append(0, np.cumsum(counts)).astype(np.int32),
+            max_size=sizes.max(),
+            min_size=0,
+            y_idx=0,
+            temporal_dtypes=new_dataset.temporal_dtypes,
+        )
+        self._scalers_transform(new_dataset)
+        self._tail_buffer.append(
+            groups, new_dataset.temporal, np.append(0, np.cumsum(sizes))
+        )
+        self._tail_last_dates[groups] = np.asarray(last_dates)[order]
+
+    def _uid_positions(self, uids) -> np.ndarray:
+        # Positions of `uids` in the stored series, -1 for the unknown ones
+        if self._uids_index is None:
+            self._uids_index = pd.Index(np.asarray(self.uids))
+        return self._uids_index.get_indexer(np.asarray(uids))
+
+    def _ids_positions(self, ids) -> np.ndarray:
+        # Sorted positions of the stored series with `ids`
+        positions = self._uid_positions(ids)
+        if positions.size == 0:
+            raise ValueError("`ids` must contain at least one id.")
+        if (positions < 0).any():
+            missing = np.asarray(ids)[positions < 0].tolist()
+            raise ValueError(f"The following ids aren't stored: {missing}")
+        return np.unique(positions)
+
+    def _stored_series(self, groups: Optional[np.ndarray] = None):
+        # Ids and last dates of the stored series at positions `groups`, all of them if None
+        uids, last_dates = self.uids, self._stored_last_dates()
+        if groups is not None:
+            uids = ufp.take_rows(uids, groups)
+            last_dates = last_dates[groups]
+        return uids, last_dates
+
+    def _stored_last_dates(self):
+        # Last dates of the stored series, including the observations added by `update`
+        if self._tail_buffer is None:
+            return self.last_dates
+        if isinstance(self.last_dates, pl_Series):
+            return pl_Series(self.time_col, self._tail_last_dates)
+        return pd.Index(self._tail_last_dates, name=self.time_col)
+
+    def _reset_updates(self) -> None:
+        # Observations added by `update`, dropped when the stored dataset is set
+        self._tail_buffer = None
+        self._tail_last_dates = None
+        self._uids_index = None
+
+    def predict_arrays(
+        self,
+        y,
+        indptr,
+        futr_exog=None,
+        static=None,
+        hist_exog=None,
+        **data_kwargs,
+    ):
+        """Predict with core.NeuralForecast from arrays.
+
+        Low latency version of `predict` for series already held in arrays. Skips the
+        DataFrame processing (frequency validation, future dataframe, joins and alignment)
+        and returns the forecasts as an array.
+        When the models were fitted with `local_scaler_type` the series must be the fitted ones, in the same order.
+
+        Parameters
+        ----------
+        y : numpy array or torch tensor
+            Target values of all the series stacked, with shape [n_rows].
+        indptr : numpy array
+            Boundaries of the series with shape [n_series + 1], serie `i` is `y[indptr[i]:indptr[i + 1]]`.
+        futr_exog : numpy array or torch tensor, optional (default=None)
+            Future exogenous with shape [n_rows + n_series * h, n_futr_exog], the rows of each serie
+            are its history followed by its `h` future values.
+            Columns in order of first appearance in the models' `futr_exog_list`.
+        static : numpy array or torch tensor, optional (default=None)
+            Static exogenous with shape [n_series, n_stat_exog], columns in order of first appearance
+            in the models' `stat_exog_list`. Defaults to the ones of the stored dataset.
+        hist_exog : numpy array or torch tensor, optional (default=None)
+            Historic exogenous with shape [n_rows, n_hist_exog], columns in order of first appearance
+            in the models' `hist_exog_list`, without the future exogenous.
+        data_kwargs : kwargs
+            Extra arguments to be passed to the dataset within each model.
+
+        Returns
+        -------
+        fcsts : numpy array
+            Forecasts with shape [n_series, h, n_outputs], outputs ordered as the columns of `predict`.
+        """
+        if not self._fitted:
+            raise Exception("You must fit the model before predicting.")
+
+        hist_cols, futr_cols, stat_cols = self._arrays_exog_cols()
+        y = torch.as_tensor(y, dtype=torch.float32).reshape(-1)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        n_series = indptr.size - 1
+        if indptr[0] != 0 or indptr[-1] != y.shape[0]:
+            raise ValueError("`indptr` must go from 0 to the number of rows of `y`.")
+        n_rows = y.shape[0]
+        hist_exog = _exog_tensor(hist_exog, n_rows, hist_cols, "hist_exog")
+        futr_exog = _exog_tensor(
+            futr_exog, n_rows + n_series * self.h, futr_cols, "futr_exog"
+        )
+        if stat_cols:
+            if static is not None:
+                static = _exog_tensor(static, n_series, stat_cols, "static")
+                static_cols = pd.Index(stat_cols)
+            elif (
+                getattr(getattr(self, "dataset", None), "static", None) is not None
+                and self.dataset.n_groups == n_series
+            ):
+                static, static_cols = self.dataset.static, self.dataset.static_cols
+            else:
+                raise ValueError(
+                    f"Models require the following static exogenous features through `static`: {stat_cols}."
+                )
+        else:
+            static, static_cols = None, None
+
+        # Only the last `lookback` timestamps of each serie are used by the models
+        sizes = np.diff(indptr)
+        lookback = self._inference_lookback()
+        if lookback is not None:
+            sizes = np.minimum(sizes, lookback)
+        hist_idxs = torch.from_numpy(_ranges_idxs(indptr[1:] - sizes, sizes))
+        futr_ends = indptr[1:] + np.arange(1, n_series + 1) * self.h
+        futr_idxs = torch.from_numpy(
+            _ranges_idxs(futr_ends - sizes - self.h, sizes + self.h)
+        )
+
+        # History followed by the h future timestamps of each serie, filled like `TimeSeriesDataset.align`
+        new_sizes = sizes + self.h
+        new_indptr = np.append(0, np.cumsum(new_sizes)).astype(np.int32)
+        curr_idxs = torch.from_numpy(_ranges_idxs(new_indptr[:-1], sizes))
+        temporal_cols = [self.target_col, *hist_cols, *futr_cols, "available_mask"]
+        temporal = torch.full(
+            (new_indptr[-1], len(temporal_cols)), np.nan, dtype=torch.float32
+        )
+        temporal[curr_idxs, 0] = y[hist_idxs]
+        temporal[curr_idxs, 1 : 1 + len(hist_cols)] = hist_exog[hist_idxs]
+        temporal[:, 1 + len(hist_cols) : -1] = futr_exog[futr_idxs]
+        temporal[:, -1] = 1.0
+        dataset = TimeSeriesDataset(
+            temporal=temporal,
+            temporal_cols=temporal_cols,
+            indptr=new_indptr,
+            max_size=new_sizes.max(),
+            min_size=new_sizes.min(),
+            y_idx=0,
+            static=static,
+            static_cols=static_cols,
+            sorted=True,
+        )
+        self._scalers_transform(dataset)
+        fcsts = self._predict_future(dataset, n_series=n_series, **data_kwargs)
+        return fcsts.reshape(n_series, self.h, -1)
+
+    def _arrays_exog_cols(self):
+        # Exogenous columns of the `predict_arrays` inputs, in order of first appearance in the models
+        def unique_cols(attr):
+            return list(
+                dict.fromkeys(
+                    chain.from_iterable(getattr(m, attr, []) for m in self.models)
+                )
+            )
+
+        futr_cols = unique_cols("futr_exog_list")
+        hist_cols = [
+            col for col in unique_cols("hist_exog_list") if col not in futr_cols
+        ]
+        return hist_cols, futr_cols, unique_cols("stat_exog_list")
+
+    def _predict_future(
+        self, dataset, n_series, state_keys=None, groups=None, **data_kwargs
+    ):
+        # Forecasts of the last h timestamps of each serie of `dataset`, in the original scale
+        # `groups` are the positions of the series among the stored ones, if they're a subset
+        # Multivariate models forecast the series jointly, their forecasts aren't cached by serie,
+        # and the ones of distribution outputs are sampled, so they change between calls
+        cache = self._predict_cache
+        if cache is None or any(
+            model.SAMPLING_TYPE == "multivariate" or model.loss.is_distribution_output
+            for model in self.models
+        ):
+            fcsts = self._predict_scaled(dataset, n_series, state_keys, **data_kwargs)
+        else:
+            fcsts = self._predict_cached(
+                cache, dataset, n_series, state_keys, **data_kwargs
+            )
+        if self.scalers_:
+            indptr = np.append(0, np.full(n_series, self.h).cumsum())
+            fcsts = self._scalers_target_inverse_transform(fcsts, indptr, groups)
+        return fcsts
+
+    def predict_cache_info(self) -> Dict[str, int]:
+        """Hits, misses and size of the cache of `predict`.
+
+        Hits and misses are counted by serie. Empty if `predict_cache_size` is None.
+        """
+        if self._predict_cache is None:
+            return {}
+        return self._predict_cache.info()
+
+    def clear_predict_cache(self) -> None:
+        """Drop the forecasts cached by `predict`.
+
+        Fitting clears the cache, call it after modifying the models' weights in place.
+        """
+        self._weights_fingerprint = None
+        if self._predict_cache is not None:
+            self._predict_cache.clear()
+
+    def _forecast_keys(self, dataset: TimeSeriesDataset, **data_kwargs) -> List[bytes]:
+        # Fingerprint of the inputs of each serie: the rows the models read (with the future
+        # exogenous), its static features, the models' weights and the prediction arguments
+        fingerprint = self._weights_fingerprint
+        if fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for model in self.models:
+                digest.update(repr(model).encode())
+                for name, tensor in model.state_dict().items():
+                    digest.update(name.encode())
+                    tensor = tensor.detach().cpu().reshape(-1)
+                    digest.update(tensor.view(torch.uint8).numpy().tobytes())
+            fingerprint = self._weights_fingerprint = digest.digest()
+        prefix = hashlib.blake2b(fingerprint, digest_size=16)
+        prefix.update(
+            repr(
+                (
+                    self.h,
+                    dataset.temporal_cols.tolist(),
+                    dataset.temporal_dtypes,
+                    sorted(data_kwargs.items()),
+                )
+            ).encode()
+        )
+        temporal = dataset.temporal.numpy()
+        static = None if dataset.static is None else dataset.static.numpy()
+        keys = []
+        for i, (start, end) in enumerate(
+            zip(dataset.indptr[:-1].tolist(), dataset.indptr[1:].tolist())
+        ):
+            digest = prefix.copy()
+            digest.update(temporal[start:end].tobytes())
+            if static is not None:
+                digest.update(static[i].tobytes())
+            keys.append(digest.digest())
+        return keys
+
+    def _predict_cached(
+        self,
+        cache: _ForecastCache,
+        dataset: TimeSeriesDataset,
+        n_series: int,
+        state_keys: Optional[list] = None,
+        **data_kwargs,
+    ):
+        # Forecasts of the series with cached inputs are reused, only the others are predicted
+        keys = self._forecast_keys(dataset, **data_kwargs)
+        cached = [cache.get(key) for key in keys]
+        fcsts: Dict[int, np.ndarray] = {
+            i: fcst for i, fcst in enumerate(cached) if fcst is not None
+        }
+        misses = np.array([i for i, fcst in enumerate(cached) if fcst is None])
+        if misses.size:
+            if misses.size < n_series:
+                dataset = dataset.select(misses)
+                if state_keys is not None:
+                    state_keys = [state_keys[i] for i in misses]
+            misses_fcsts = self._predict_scaled(
+                dataset, misses.size, state_keys, **data_kwargs
+            )
+            misses_fcsts = misses_fcsts.reshape(misses.size, self.h, -1)
+            for i, fcst in zip(misses.tolist(), misses_fcsts):
+                fcsts[i] = fcst.copy()
+                cache.put(keys[i], fcsts[i])
+        return np.concatenate([fcsts[i] for i in range(len(keys))])
+
+    def _predict_scaled(self, dataset, n_series, state_keys=None, **data_kwargs):
+        # Forecasts of the models for the last h timestamps of each serie, in the scale of `dataset`
+        n_outputs = sum(len(model.loss.output_names) for model in self.models)
+        col_idx = 0
+        fcsts = np.full(
+            (self.h * n_series, n_outputs), fill_value=np.nan, dtype=np.float32
+        )
+        old_test_sizes = [model.get_test_size() for model in self.models]
+        for model in self.models:
+            model.set_test_size(self.h)  # To predict h steps ahead
+        models_fcsts = self._predict_models(dataset, state_keys, **data_kwargs)
+        for model, model_fcsts, old_test_size in zip(
+            self.models, models_fcsts, old_test_sizes
+        ):
+            # Append predictions in memory placeholder
+            output_length = len(model.loss.output_names)
+            fcsts[:, col_idx : col_idx + output_length] = model_fcsts
+            col_idx += output_length
+            model.set_test_size(old_test_size)  # Set back to original value
+        return fcsts
+
+    def _inference_lookback(self) -> Optional[int]:
+        # Largest number of past timestamps of each serie that the models read in predict
+        lookbacks = []
+        for model in self.models:
+            lookback = (
+                model._inference_lookback() if isinstance(model, BaseModel) else None
+            )
+            if lookback is None:
+                return None
+            lookbacks.append(lookback)
+        return max(lookbacks)
+
+    def _predict_models(self, dataset, state_keys=None, **data_kwargs):
+        # Models with the same windows and normalization are predicted together.
+        # Recurrent models with `hidden_state_cache` resume the series of `state_keys`
+        groups = {}
+        for i, model in enumerate(self.models):
+            key = model._shared_windows_key() if isinstance(model, BaseModel) else None
+            groups.setdefault(i if key is None else key, []).append(i)
+        models_fcsts = [None] * len(self.models)
+        for idxs in groups.values():
+            models = [self.models[i] for i in idxs]
+            if len(models) > 1:
+                group_fcsts = models[0]._predict_shared(models, dataset, **data_kwargs)
+            elif state_keys is not None and getattr(
+                models[0], "hidden_state_cache", False
+            ):
+                group_fcsts = [
+                    models[0].predict(
+                        dataset=dataset, state_keys=state_keys, **data_kwargs
+                    )
+                ]
+            else:
+                group_fcsts = [models[0].predict(dataset=dataset, **data_kwargs)]
+            for i, model_fcsts in zip(idxs, group_fcsts):
+                models_fcsts[i] = model_fcsts
+        return models_fcsts
+
     def _reset_models(self):
         self.models = [deepcopy(model) for model in self.models_init]
+        if self.inference_engine is not None:
+            for model in self.models:
+                if isinstance(model, BaseModel):
+                    model.inference_engine = self.inference_engine
         if self._fitted:
             print("WARNING: Deleting previously fitted models.")
 
@@ -869,6 +1570,7 @@ class NeuralForecast:
                 target_col=target_col,
             )
             self.sort_df = sort_df
+            self._reset_updates()
         else:
             if verbose:
                 print("Using stored dataset.")
@@ -910,10 +1612,10 @@ class NeuralForecast:
 
         for model in self.models:
             model.fit(dataset=self.dataset, val_size=val_size, test_size=test_size)
-            model_fcsts = model.predict(
-                self.dataset, step_size=step_size, **data_kwargs
-            )
-
+        models_fcsts = self._predict_models(
+            self.dataset, step_size=step_size, **data_kwargs
+        )
+        for model, model_fcsts in zip(self.models, models_fcsts):
             # Append predictions in memory placeholder
             output_length = len(model.loss.output_names)
             fcsts[:, col_idx : (col_idx + output_length)] = model_fcsts
@@ -943,6 +1645,7 @@ class NeuralForecast:
                 fcsts = trimmed
 
         self._fitted = True
+        self.clear_predict_cache()
 
         # Add predictions to forecasts DataFrame
         if isinstance(self.uids, pl_Series):
@@ -1173,14 +1876,9 @@ class NeuralForecast:
             trimmed_dataset = TimeSeriesDataset.trim_dataset(
                 dataset=self.dataset, right_trim=test_size, left_trim=forefront_offset
             )
-            new_idxs = np.hstack(
-                [
-                    np.arange(
-                        self.dataset.indptr[i] + forefront_offset,
-                        self.dataset.indptr[i + 1] - test_size,
-                    )
-                    for i in range(self.dataset.n_groups)
-                ]
+            new_idxs = _ranges_idxs(
+                self.dataset.indptr[:-1] + forefront_offset,
+                np.diff(trimmed_dataset.indptr),
             )
             times = self.ds[new_idxs]
         else:
@@ -1218,7 +1916,7 @@ class NeuralForecast:
         original_y = {
             self.id_col: ufp.repeat(self.uids, np.diff(self.dataset.indptr)),
             self.time_col: self.ds,
-            self.target_col: self.dataset.temporal[:, 0].numpy(),
+            self.target_col: self.dataset._temporal_column(0).numpy(),
         }
 
         # Add predictions to forecasts DataFrame
@@ -1318,8 +2016,18 @@ class NeuralForecast:
                     "You can set `save_dataset=False` and use the `df` argument in the predict method after loading "
                     "this model to use it for inference."
                 )
-            with fsspec.open(f"{path}/dataset.pkl", "wb") as f:
-                pickle.dump(self.dataset, f)
+            if self._tail_buffer is not None:
+                warnings.warn(
+                    "The observations added with `update` aren't saved. "
+                    "Pass them again to `update` after loading the model."
+                )
+            # columnar layout that can be memory-mapped by `load`
+            self.dataset.save(
+                f"{path}/dataset",
+                uids=self.uids,
+                last_dates=self.last_dates,
+                ds=self.ds,
+            )
         elif save_dataset:
             raise Exception(
                 "You need to have a stored dataset to save it, \
@@ -1328,30 +2036,26 @@ class NeuralForecast:
 
         # Save configuration and parameters
         config_dict = {
+            "format_version": TimeSeriesDataset.FORMAT_VERSION,
             "h": self.h,
             "freq": self.freq,
             "sort_df": self.sort_df,
             "_fitted": self._fitted,
             "local_scaler_type": self.local_scaler_type,
+            "temporal_dtypes": self.temporal_dtypes,
+            "inference_engine": self.inference_engine,
+            "predict_cache_size": self.predict_cache_size,
             "scalers_": self.scalers_,
             "id_col": self.id_col,
             "time_col": self.time_col,
             "target_col": self.target_col,
         }
-        if save_dataset:
-            config_dict.update(
-                {
-                    "uids": self.uids,
-                    "last_dates": self.last_dates,
-                    "ds": self.ds,
-                }
-            )
 
         with fsspec.open(f"{path}/configuration.pkl", "wb") as f:
             pickle.dump(config_dict, f)
 
     @staticmethod
-    def load(path, verbose=False, **kwargs):
+    def load(path, verbose=False, mmap=False, **kwargs):
         """Load NeuralForecast
 
         `core.NeuralForecast`'s method to load checkpoint from path.
@@ -1360,6 +2064,11 @@ class NeuralForecast:
         -----------
         path : str
             Directory with stored artifacts.
+        verbose : bool (default=False)
+            Print the loading progress.
+        mmap : bool (default=False)
+            Memory-map the stored dataset instead of reading it, only available for local paths.
+            Datasets stored in the previous pickle format are always read.
         kwargs
             Additional keyword arguments to be passed to the function
             `load_from_checkpoint`.
@@ -1402,13 +2111,17 @@ class NeuralForecast:
 
         if verbose:
             print(10 * "-" + " Loading dataset " + 10 * "-")
-        # Load dataset
-        try:
+        # Load dataset, pickled datasets come from previous versions
+        if fs.exists(f"{path}/dataset/metadata.json"):
+            dataset = TimeSeriesDataset.load(f"{path}/dataset", mmap=mmap)
+            if verbose:
+                print("Dataset loaded.")
+        elif "dataset.pkl" in files:
             with fsspec.open(f"{path}/dataset.pkl", "rb") as f:
                 dataset = pickle.load(f)
             if verbose:
                 print("Dataset loaded.")
-        except FileNotFoundError:
+        else:
             dataset = None
             if verbose:
                 print("No dataset found in directory.")
@@ -1429,6 +2142,9 @@ class NeuralForecast:
             models=models,
             freq=config_dict["freq"],
             local_scaler_type=config_dict["local_scaler_type"],
+            temporal_dtypes=config_dict.get("temporal_dtypes"),
+            inference_engine=config_dict.get("inference_engine"),
+            predict_cache_size=config_dict.get("predict_cache_size"),
         )
 
         for attr in ["id_col", "time_col", "target_col"]:
@@ -1437,14 +2153,15 @@ class NeuralForecast:
         # Dataset
         if dataset is not None:
             neuralforecast.dataset = dataset
-            restore_attrs = [
-                "uids",
-                "last_dates",
-                "ds",
-                "sort_df",
-            ]
-            for attr in restore_attrs:
-                setattr(neuralforecast, attr, config_dict[attr])
+            if "uids" in config_dict:
+                restore_attrs = ["uids", "last_dates", "ds"]
+                for attr in restore_attrs:
+                    setattr(neuralforecast, attr, config_dict[attr])
+            else:
+                neuralforecast.uids = dataset.uids
+                neuralforecast.last_dates = dataset.last_dates
+                neuralforecast.ds = dataset.ds
+            neuralforecast.sort_df = config_dict["sort_df"]
 
         # Fitted flag
         neuralforecast._fitted = config_dict["_fitted"]
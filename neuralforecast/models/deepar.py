@@ -298,9 +298,7 @@ class DeepAR(BaseWindows):
         if self.val_size == 0:
             return np.nan
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="val")
-        n_windows = len(windows["temporal"])
+        n_windows = self._n_windows(batch, step="val")
         y_idx = batch["y_idx"]
 
         # Number of windows in batch
@@ -366,9 +364,7 @@ class DeepAR(BaseWindows):
 
         self.h == self.horizon_backup
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="predict")
-        n_windows = len(windows["temporal"])
+        n_windows = self._n_windows(batch, step="predict")
         y_idx = batch["y_idx"]
 
         # Number of windows in batch
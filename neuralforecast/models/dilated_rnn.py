@@ -329,6 +329,7 @@ class DilatedRNN(BaseRecurrent):
     EXOGENOUS_FUTR = True
     EXOGENOUS_HIST = True
     EXOGENOUS_STAT = True
+    STATEFUL = True
 
     def __init__(
         self,
@@ -392,6 +393,11 @@ class DilatedRNN(BaseRecurrent):
         )
 
         # Dilated RNN
+        stateful = self.hidden_state_cache or self.tbptt_steps > 0
+        if stateful and cell_type not in ["GRU", "RNN"]:
+            raise Exception(
+                "DilatedRNN only supports hidden_state_cache and tbptt_steps with cell_type 'GRU' or 'RNN'."
+            )
         self.cell_type = cell_type
         self.dilations = dilations
         self.encoder_hidden_size = encoder_hidden_size
@@ -464,28 +470,49 @@ class DilatedRNN(BaseRecurrent):
             )  # [B, S] -> [B, seq_len, S]
             encoder_input = torch.cat((encoder_input, stat_exog), dim=2)
 
-        # DilatedRNN forward
+        # DilatedRNN forward, from the cached encoder state if any.
+        # The state of a dilated layer is its last `dilation` outputs [dilation, B, H]
+        encoder_state = windows_batch.get("encoder_state")
+        last_outputs = []
         for layer_num in range(len(self.rnn_stack)):
             residual = encoder_input
-            output, _ = self.rnn_stack[layer_num](encoder_input)
+            layer = self.rnn_stack[layer_num]
+            previous = None
+            if encoder_state is not None:
+                start = len(last_outputs)
+                previous = encoder_state[start : start + len(layer.dilations)]
+            output, layer_outputs = layer(
+                encoder_input, None if previous is None else list(previous)
+            )
+            for i, (outputs, dilation) in enumerate(
+                zip(layer_outputs, layer.dilations)
+            ):
+                if previous is not None:
+                    outputs = torch.cat((previous[i], outputs))[-dilation:]
+                # Sequences shorter than the dilation start from zero states
+                padding = outputs.new_zeros(dilation - len(outputs), *outputs.shape[1:])
+                last_outputs.append(torch.cat((padding, outputs)))
             if layer_num > 0:
                 output += residual
             encoder_input = output
+        windows_batch["encoder_state"] = tuple(last_outputs)
 
-        if self.futr_exog_size > 0:
-            futr_exog = futr_exog.permute(0, 2, 3, 1)[
-                :, :, 1:, :
-            ]  # [B, F, seq_len, 1+H] -> [B, seq_len, H, F]
-            encoder_input = torch.cat(
-                (encoder_input, futr_exog.reshape(batch_size, seq_len, -1)), dim=2
-            )
+        # Only the windows forecasted by `predict` are decoded
+        windows = windows_batch.get("output_windows", slice(None))
+        encoder_input = encoder_input[:, windows]
+        n_windows = encoder_input.shape[1]
 
-        # Context adapter
-        context = self.context_adapter(encoder_input)
-        context = context.reshape(batch_size, seq_len, self.h, self.context_size)
+        # Context adapter, with the future exogenous of each horizon read from [B, F, seq_len+H]
+        context = self._adapt_context(
+            self.context_adapter, encoder_input, futr_exog, windows
+        )
+        context = context.reshape(batch_size, n_windows, self.h, self.context_size)
 
         # Residual connection with futr_exog
         if self.futr_exog_size > 0:
+            futr_exog = self._futr_exog_horizons(futr_exog)[
+                :, windows
+            ]  # [B, F, seq_len+H] -> [B, n_windows, H, F]
             context = torch.cat((context, futr_exog), dim=-1)
 
         # Final forecast
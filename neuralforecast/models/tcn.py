@@ -193,20 +193,22 @@ class TCN(BaseRecurrent):
             encoder_input
         )  # [B, seq_len, tcn_hidden_state]
 
-        if self.futr_exog_size > 0:
-            futr_exog = futr_exog.permute(0, 2, 3, 1)[
-                :, :, 1:, :
-            ]  # [B, F, seq_len, 1+H] -> [B, seq_len, H, F]
-            hidden_state = torch.cat(
-                (hidden_state, futr_exog.reshape(batch_size, seq_len, -1)), dim=2
-            )
-
-        # Context adapter
-        context = self.context_adapter(hidden_state)
-        context = context.reshape(batch_size, seq_len, self.h, self.context_size)
+        # Only the windows forecasted by `predict` are decoded
+        windows = windows_batch.get("output_windows", slice(None))
+        hidden_state = hidden_state[:, windows]
+        n_windows = hidden_state.shape[1]
+
+        # Context adapter, with the future exogenous of each horizon read from [B, F, seq_len+H]
+        context = self._adapt_context(
+            self.context_adapter, hidden_state, futr_exog, windows
+        )
+        context = context.reshape(batch_size, n_windows, self.h, self.context_size)
 
         # Residual connection with futr_exog
         if self.futr_exog_size > 0:
+            futr_exog = self._futr_exog_horizons(futr_exog)[
+                :, windows
+            ]  # [B, F, seq_len+H] -> [B, n_windows, H, F]
             context = torch.cat((context, futr_exog), dim=-1)
 
         # Final forecast
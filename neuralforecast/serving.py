@@ -0,0 +1,269 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/serving.ipynb.
+
+# %% auto 0
+__all__ = ['ForecastServer']
+
+# %% ../nbs/serving.ipynb 4
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .core import NeuralForecast
+
+# %% ../nbs/serving.ipynb 5
+class ForecastServer:
+    """Micro-batching asynchronous forecast server.
+
+    Keeps a fitted `core.NeuralForecast` warm and serves concurrent forecast requests.
+    The requests are collected into micro-batches, each of them forecasted with a single
+    call to `NeuralForecast.predict`, and the forecasts are scattered back to the callers.
+    A micro-batch is closed when it reaches `max_batch_size` requests or `max_wait_ms`
+    milliseconds after its first request arrived.
+
+    Parameters
+    ----------
+    nf : NeuralForecast
+        Fitted `core.NeuralForecast`.
+    max_batch_size : int (default=64)
+        Maximum number of requests forecasted together.
+    max_wait_ms : float (default=5.0)
+        Maximum time in milliseconds that the first request of a micro-batch waits for others.
+    """
+
+    def __init__(
+        self, nf: NeuralForecast, max_batch_size: int = 64, max_wait_ms: float = 5.0
+    ):
+        if not nf._fitted:
+            raise Exception("You must fit the model before serving it.")
+        if nf.scalers_ and not hasattr(nf, "uids"):
+            raise ValueError(
+                "Models fitted with `local_scaler_type` need the ids of their stored series "
+                "to scale the requests, save them with `save_dataset=True`."
+            )
+        if max_batch_size < 1:
+            raise ValueError("`max_batch_size` must be at least 1.")
+        if max_wait_ms < 0:
+            raise ValueError("`max_wait_ms` must be non negative.")
+        self.nf = nf
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.n_requests = 0
+        self.n_batches = 0
+        self.batch_size_counts: Counter = Counter()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def load(
+        cls, path: str, max_batch_size: int = 64, max_wait_ms: float = 5.0, **kwargs
+    ) -> "ForecastServer":
+        """Load a `ForecastServer` from the artifacts saved by `NeuralForecast.save`.
+
+        Parameters
+        ----------
+        path : str
+            Directory with stored artifacts.
+        max_batch_size : int (default=64)
+            Maximum number of requests forecasted together.
+        max_wait_ms : float (default=5.0)
+            Maximum time in milliseconds that the first request of a micro-batch waits for others.
+        kwargs
+            Additional keyword arguments to be passed to `NeuralForecast.load`.
+
+        Returns
+        -------
+        server : ForecastServer
+            Server around the loaded `core.NeuralForecast`, not started.
+        """
+        return cls(
+            NeuralForecast.load(path, **kwargs),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the server accepts requests."""
+        return self._worker is not None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a micro-batch."""
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def metrics(self) -> dict:
+        """Queue depth and micro-batch size metrics of the server."""
+        return {
+            "queue_depth": self.queue_depth,
+            "n_requests": self.n_requests,
+            "n_batches": self.n_batches,
+            "mean_batch_size": (
+                self.n_requests / self.n_batches if self.n_batches else 0.0
+            ),
+            "batch_size_counts": dict(self.batch_size_counts),
+        }
+
+    async def start(self) -> None:
+        """Start collecting and forecasting requests in the running event loop."""
+        if self.running:
+            return
+        queue: asyncio.Queue = asyncio.Queue()
+        # The models are not thread safe, micro-batches are forecasted one at a time
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._queue, self._executor = queue, executor
+        self._worker = asyncio.create_task(self._serve(queue, executor))
+
+    async def stop(self) -> None:
+        """Stop the server once the requests already received are forecasted."""
+        worker, queue, executor = self._worker, self._queue, self._executor
+        if worker is None or queue is None or executor is None:
+            return
+        self._worker = None
+        queue.put_nowait(None)
+        await worker
+        executor.shutdown()
+        self._queue = self._executor = None
+
+    async def __aenter__(self) -> "ForecastServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def predict(
+        self,
+        df: pd.DataFrame,
+        static_df: Optional[pd.DataFrame] = None,
+        futr_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Forecast the series of `df` within the next micro-batch.
+
+        Parameters
+        ----------
+        df : pandas DataFrame
+            DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
+        static_df : pandas DataFrame, optional (default=None)
+            DataFrame with columns [`unique_id`] and static exogenous.
+        futr_df : pandas DataFrame, optional (default=None)
+            DataFrame with [`unique_id`, `ds`] columns and `df`'s future exogenous.
+
+        Returns
+        -------
+        fcsts_df : pandas DataFrame
+            DataFrame with insample `models` columns for point predictions and probabilistic
+            predictions for all fitted `models`, as returned by `NeuralForecast.predict`.
+        """
+        if not self.running or self._queue is None:
+            raise RuntimeError("The server is not running, call `start` first.")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((df, static_df, futr_df, future))
+        return await future
+
+    async def _serve(self, queue: asyncio.Queue, executor: ThreadPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            request = await queue.get()
+            if request is None:
+                break
+            batch = [request]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        request = await asyncio.wait_for(queue.get(), timeout)
+                    else:
+                        request = queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            # Callers that were cancelled while waiting don't need a forecast
+            batch = [request for request in batch if not request[-1].done()]
+            if not batch:
+                continue
+            self.n_requests += len(batch)
+            self.n_batches += 1
+            self.batch_size_counts[len(batch)] += 1
+            results = await loop.run_in_executor(
+                executor, self._predict_batch, [request[:3] for request in batch]
+            )
+            for (*_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _predict_batch(self, requests: List[tuple]) -> list:
+        # Forecasts or exception of each request
+        try:
+            return self._predict_requests(requests)
+        except Exception as exc:
+            if len(requests) == 1:
+                return [exc]
+        # Forecast the requests one by one so that only the invalid ones fail
+        return [self._predict_batch([request])[0] for request in requests]
+
+    def _predict_requests(self, requests: List[tuple]) -> List[pd.DataFrame]:
+        # The ids of the requests are replaced by consecutive integers, so that
+        # different requests can send the same ids and keep contiguous forecasts.
+        # Local scalers apply the statistics of the stored series with the original ids
+        id_col = self.nf.id_col
+        scaled = bool(self.nf.scalers_)
+        positions: List[np.ndarray] = []
+        dfs: List[pd.DataFrame] = []
+        static_dfs: List[pd.DataFrame] = []
+        futr_dfs: List[pd.DataFrame] = []
+        uniques: List[pd.Index] = []
+        offsets = [0]
+        for df, static_df, futr_df in requests:
+            codes, ids = df[id_col].factorize()
+            dfs.append(df.assign(**{id_col: codes + offsets[-1]}))
+            for other, others in ((static_df, static_dfs), (futr_df, futr_dfs)):
+                if other is None:
+                    continue
+                idxs = ids.get_indexer(other[id_col])
+                other = other[idxs >= 0]
+                others.append(other.assign(**{id_col: idxs[idxs >= 0] + offsets[-1]}))
+            if scaled:
+                idxs = self.nf._uid_positions(ids)
+                if (idxs < 0).any():
+                    raise ValueError(
+                        "Series scaled with `local_scaler_type` must be stored, "
+                        f"these aren't: {ids[idxs < 0].tolist()}"
+                    )
+                positions.append(idxs)
+            uniques.append(ids)
+            offsets.append(offsets[-1] + len(ids))
+        futr_df = pd.concat(futr_dfs, ignore_index=True) if futr_dfs else None
+        self.nf._check_futr_exog(futr_df)
+        fcsts = self.nf._predict_local(
+            df=pd.concat(dfs, ignore_index=True),
+            static_df=pd.concat(static_dfs, ignore_index=True) if static_dfs else None,
+            futr_df=futr_df,
+            groups=np.concatenate(positions) if scaled else None,
+        )
+        id_as_idx = id_col not in fcsts.columns
+        if id_as_idx:
+            fcsts = fcsts.reset_index()
+        fcsts_ids = fcsts[id_col].to_numpy()
+        bounds = np.searchsorted(fcsts_ids, offsets)
+        results = []
+        for ids, offset, start, end in zip(uniques, offsets, bounds[:-1], bounds[1:]):
+            result = fcsts.iloc[start:end].reset_index(drop=True)
+            result[id_col] = ids.take(fcsts_ids[start:end] - offset)
+            if id_as_idx:
+                result = result.set_index(id_col)
+            results.append(result)
+        return results
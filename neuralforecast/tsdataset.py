@@ -1,20 +1,29 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/tsdataset.ipynb.
 
 # %% auto 0
-__all__ = ['TimeSeriesLoader', 'TimeSeriesDataset', 'TimeSeriesDataModule']
+__all__ = ['TimeSeriesLoader', 'TimeSeriesDataset', 'ParquetTimeSeriesDataset', 'TimeSeriesDataModule']
 
 # %% ../nbs/tsdataset.ipynb 4
+import json
+import pickle
+import sys
 import warnings
+import weakref
 from collections.abc import Mapping
-from typing import List, Optional, Union
+from copy import copy
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Union
 
+import fsspec
 import numpy as np
 import pandas as pd
 import pytorch_lightning as pl
 import torch
 import utilsforecast.processing as ufp
-from torch.utils.data import Dataset, DataLoader
+from fsspec.implementations.local import LocalFileSystem
+from torch.utils.data import Dataset, DataLoader, IterableDataset, Sampler
 from utilsforecast.compat import DataFrame, pl_Series
+from utilsforecast.validation import validate_format
 
 # %% ../nbs/tsdataset.ipynb 5
 class TimeSeriesLoader(DataLoader):
@@ -42,6 +51,10 @@ class TimeSeriesLoader(DataLoader):
         DataLoader.__init__(self, dataset=dataset, **kwargs_)
 
     def _collate_fn(self, batch):
+        if isinstance(batch, Mapping):
+            # Already batched by the dataset's `__getitems__`
+            return batch
+
         elem = batch[0]
         elem_type = type(elem)
 
@@ -74,8 +87,188 @@ class TimeSeriesLoader(DataLoader):
         raise TypeError(f"Unknown {elem_type}")
 
 # %% ../nbs/tsdataset.ipynb 7
+def _ranges_idxs(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Flat indices of the concatenated ranges `[starts[i], starts[i] + lengths[i])`."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.asarray(starts, dtype=np.int64) - np.cumsum(lengths) + lengths
+    return np.repeat(offsets, lengths) + np.arange(lengths.sum(), dtype=np.int64)
+
+# %% ../nbs/tsdataset.ipynb 8
+class _BatchBuffers:
+    """Ring of reusable, optionally pinned, buffers for the batches of a loader.
+
+    A buffer is handed out again `n_buffers` batches later, so at most
+    `n_buffers - 1` batches can be in use at once, the batch prefetched
+    by the trainer included.
+    """
+
+    def __init__(self, n_buffers: int = 3, pin_memory: bool = False):
+        self.buffers: List[Optional[torch.Tensor]] = [None] * n_buffers
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self.position = 0
+
+    def get(self, numel: int) -> torch.Tensor:
+        buffer = self.buffers[self.position]
+        if buffer is None or buffer.numel() < numel:
+            buffer = torch.empty(numel, dtype=torch.float32, pin_memory=self.pin_memory)
+            self.buffers[self.position] = buffer
+        self.position = (self.position + 1) % len(self.buffers)
+        return buffer[:numel]
+
+# %% ../nbs/tsdataset.ipynb 9
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # before python 3.13 attaching registers the block in the resource tracker,
+    # which unlinks it when this process exits. Only its creator should unlink it.
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _unlink_shared_memory(blocks: List[shared_memory.SharedMemory]) -> None:
+    for shm in blocks:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+# %% ../nbs/tsdataset.ipynb 10
+def _column_to_numpy(col) -> np.ndarray:
+    """Values of a pandas or polars column, read in place when possible."""
+    if isinstance(col, pl_Series):
+        # categoricals as codes, numeric columns without nulls are zero-copy
+        return col.to_physical().to_numpy()
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy()
+    if isinstance(col.dtype, pd.ArrowDtype):
+        chunks = [
+            chunk.to_numpy(zero_copy_only=False)
+            for chunk in col.array.__arrow_array__().chunks
+        ]
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks)
+    return col.to_numpy()
+
+# %% ../nbs/tsdataset.ipynb 11
+def _column_type(col) -> str:
+    """Kind of a column: 'pandas.Index', 'pandas.Series' or 'polars.Series'."""
+    if isinstance(col, pd.Index):
+        return "pandas.Index"
+    if isinstance(col, pd.Series):
+        return "pandas.Series"
+    return "polars.Series"
+
+
+def _column_to_arrow(col):
+    """Arrow array with the values of a pandas Series/Index or a polars Series."""
+    import pyarrow as pa
+
+    if isinstance(col, pd.Index):
+        col = col.to_series(index=pd.RangeIndex(len(col)))
+    if isinstance(col, pd.Series):
+        return pa.array(col)
+    return col.to_arrow()
+
+
+def _column_from_arrow(array, col_type: str, name):
+    """Inverse of `_column_to_arrow`, `col_type` comes from `_column_type`."""
+    if col_type == "pandas.Index":
+        return pd.Index(array.to_pandas(), name=name)
+    if col_type == "pandas.Series":
+        return array.to_pandas().rename(name)
+    import polars as pl
+
+    return pl.Series(name, array)
+
+# %% ../nbs/tsdataset.ipynb 12
+class _TemporalLayout:
+    """Row layout of a `temporal` buffer with a storage dtype per column.
+
+    The columns are packed into a single uint8 tensor of shape `[n_rows, row_bytes]`,
+    so the row operations on `temporal` (gathers, append, trim, memory mapping and
+    shared memory) work as with a float32 buffer. Columns are decoded to float32.
+    """
+
+    DTYPES = {
+        "float32": torch.float32,
+        "float16": torch.float16,
+        "bfloat16": torch.bfloat16,
+        "int16": torch.int16,
+        "int8": torch.int8,
+        "uint8": torch.uint8,
+    }
+
+    def __init__(self, dtypes: List[str]):
+        invalid = set(dtypes) - set(self.DTYPES)
+        if invalid:
+            raise ValueError(
+                f"Storage dtypes must be in {list(self.DTYPES)}, got {sorted(invalid)}."
+            )
+        self.dtypes = list(dtypes)
+        self.torch_dtypes = [self.DTYPES[dtype] for dtype in self.dtypes]
+        self.sizes = [
+            torch.empty(0, dtype=dtype).element_size() for dtype in self.torch_dtypes
+        ]
+        # widest columns first, so that every column is aligned to its size
+        self.offsets = [0] * len(self.sizes)
+        offset = 0
+        for i in sorted(range(len(self.sizes)), key=lambda i: -self.sizes[i]):
+            self.offsets[i] = offset
+            offset += self.sizes[i]
+        widest = max(self.sizes)
+        self.row_bytes = -(-offset // widest) * widest
+
+    def empty(self, n_rows: int) -> torch.Tensor:
+        return torch.zeros((n_rows, self.row_bytes), dtype=torch.uint8)
+
+    def column(self, temporal: torch.Tensor, i: int) -> torch.Tensor:
+        """View of the i-th column of `temporal` with its storage dtype."""
+        offset, size = self.offsets[i], self.sizes[i]
+        return temporal[:, offset : offset + size].view(self.torch_dtypes[i])[:, 0]
+
+    def set_column(self, temporal: torch.Tensor, i: int, values) -> None:
+        values = torch.as_tensor(values)
+        dtype = self.torch_dtypes[i]
+        if not dtype.is_floating_point:
+            info = torch.iinfo(dtype)
+            valid = (
+                (values == values.round()) & (values >= info.min) & (values <= info.max)
+            )
+            if not valid.all():
+                raise ValueError(
+                    f"Column {i} is stored as {self.dtypes[i]} but has values that are "
+                    f"missing, not integers or outside [{info.min}, {info.max}]."
+                )
+        elif torch.finfo(dtype).max < torch.finfo(values.dtype).max:
+            finite = values[torch.isfinite(values)]
+            if finite.numel() and finite.abs().max() > torch.finfo(dtype).max:
+                raise ValueError(
+                    f"Column {i} has values that overflow its storage dtype {self.dtypes[i]}."
+                )
+        self.column(temporal, i)[:] = values
+
+    def decode(
+        self, rows: torch.Tensor, out: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """float32 `[n_rows, n_cols]` values of the packed `rows`."""
+        if out is None:
+            out = torch.empty((rows.shape[0], len(self.dtypes)), dtype=torch.float32)
+        for i in range(len(self.dtypes)):
+            out[:, i] = self.column(rows, i)
+        return out
+
+# %% ../nbs/tsdataset.ipynb 13
 class TimeSeriesDataset(Dataset):
 
+    # Version of the on-disk layout written by `save`
+    FORMAT_VERSION = 1
+
     def __init__(
         self,
         temporal,
@@ -87,13 +280,31 @@ class TimeSeriesDataset(Dataset):
         static=None,
         static_cols=None,
         sorted=False,
+        temporal_dtypes=None,
     ):
         super().__init__()
-        self.temporal = self._as_torch_copy(temporal)
         self.temporal_cols = pd.Index(list(temporal_cols))
+        # Storage dtype of each temporal column, when they aren't all float32
+        # the columns are packed in the uint8 rows of a `_TemporalLayout`
+        if temporal_dtypes is not None and any(
+            dtype != "float32" for dtype in temporal_dtypes
+        ):
+            self.temporal_dtypes: Optional[List[str]] = list(temporal_dtypes)
+            self._layout: Optional[_TemporalLayout] = _TemporalLayout(
+                self.temporal_dtypes
+            )
+            self.temporal = self._as_torch(temporal, dtype=torch.uint8)
+            if self.temporal.shape[1] != self._layout.row_bytes:
+                raise ValueError(
+                    f"`temporal` must have {self._layout.row_bytes} bytes per row for `temporal_dtypes={temporal_dtypes}`."
+                )
+        else:
+            self.temporal_dtypes = None
+            self._layout = None
+            self.temporal = self._as_torch(temporal)
 
         if static is not None:
-            self.static = self._as_torch_copy(static)
+            self.static = self._as_torch(static)
             self.static_cols = static_cols
         else:
             self.static = static
@@ -109,6 +320,18 @@ class TimeSeriesDataset(Dataset):
         self.updated = False
         self.sorted = sorted
 
+        # Series identifiers and times, only set for datasets restored with `load`
+        self.uids = None
+        self.last_dates = None
+        self.ds = None
+
+        # Names, shapes and dtypes of the shared memory blocks, set by `share_memory`
+        self._shm_specs = None
+        self._shm_blocks = None
+
+        # Copy-on-write mapping of the temporal rows, set by `load`
+        self._temporal_mmap: Optional[np.memmap] = None
+
     def __getitem__(self, idx):
         if isinstance(idx, int):
             # Parse temporal data and pad its left
@@ -116,6 +339,8 @@ class TimeSeriesDataset(Dataset):
                 size=(len(self.temporal_cols), self.max_size), dtype=torch.float32
             )
             ts = self.temporal[self.indptr[idx] : self.indptr[idx + 1], :]
+            if self._layout is not None:
+                ts = self._layout.decode(ts)
             temporal[: len(self.temporal_cols), -len(ts) :] = ts.permute(1, 0)
 
             # Add static data if available
@@ -132,6 +357,60 @@ class TimeSeriesDataset(Dataset):
             return item
         raise ValueError(f"idx must be int, got {type(idx)}")
 
+    def __getitems__(self, idxs):
+        # Batched fetch used by the DataLoader, replaces `__getitem__` + collate
+        return self._gather(idxs)
+
+    def _gather(self, idxs, size=None, buffers=None):
+        """Batch of the series `idxs` left-padded to `size` (default `max_size`).
+
+        The rows of all series are gathered from `temporal` with a single
+        index operation, into a buffer from `buffers` if provided.
+        """
+        idxs = np.asarray(idxs, dtype=np.int64)
+        size = self.max_size if size is None else size
+        n_cols = len(self.temporal_cols)
+        starts = self.indptr[idxs]
+        sizes = self.indptr[idxs + 1] - starts
+
+        # [B, T] positions within each series, negative ones are padding
+        positions = np.arange(size) - (size - sizes)[:, None]
+        rows = starts[:, None] + np.maximum(positions, 0)
+        out = None
+        if buffers is not None:
+            out = buffers.get(len(idxs) * size * n_cols).view(-1, n_cols)
+        temporal = self._take_rows(torch.from_numpy(rows.reshape(-1)), out=out)
+        temporal = temporal.view(len(idxs), size, n_cols)
+        temporal[torch.from_numpy(positions < 0)] = 0.0
+
+        batch = dict(
+            temporal=temporal.permute(0, 2, 1),
+            temporal_cols=self.temporal_cols,
+            y_idx=self.y_idx,
+        )
+        if self.static is not None:
+            batch["static"] = self.static[torch.from_numpy(idxs)]
+            batch["static_cols"] = self.static_cols
+        return batch
+
+    def _take_rows(self, rows: torch.Tensor, out=None) -> torch.Tensor:
+        """float32 `[len(rows), n_cols]` values of the `rows` of `temporal`."""
+        if self._layout is None:
+            return torch.index_select(self.temporal, 0, rows, out=out)
+        return self._layout.decode(torch.index_select(self.temporal, 0, rows), out=out)
+
+    def _temporal_column(self, i: int) -> torch.Tensor:
+        """float32 values of the i-th temporal column, a view when stored as float32."""
+        if self._layout is None:
+            return self.temporal[:, i]
+        return self._layout.column(self.temporal, i).float()
+
+    def _set_temporal_column(self, i: int, values) -> None:
+        if self._layout is None:
+            self.temporal[:, i] = torch.as_tensor(values)
+        else:
+            self._layout.set_column(self.temporal, i, values)
+
     def __len__(self):
         return self.n_groups
 
@@ -145,14 +424,70 @@ class TimeSeriesDataset(Dataset):
             self.indptr, other.indptr
         )
 
-    def _as_torch_copy(
+    def share_memory(self) -> "TimeSeriesDataset":
+        """Move `temporal`, `static` and `indptr` into shared memory blocks.
+
+        Pickling a shared dataset only sends the names of its blocks, so DataLoader
+        workers, Ray trials and any other process on the same host attach to the
+        same memory instead of unpickling their own copy. The blocks are unlinked
+        when the dataset that created them is garbage collected.
+        """
+        if self._shm_specs is not None:
+            return self
+        arrays = {"temporal": self.temporal.numpy(), "indptr": np.asarray(self.indptr)}
+        if self.static is not None:
+            arrays["static"] = self.static.numpy()
+        specs, blocks = {}, []
+        for attr, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            specs[attr] = (shm.name, array.shape, array.dtype.str)
+            blocks.append(shm)
+        weakref.finalize(self, _unlink_shared_memory, blocks)
+        self._set_shared(specs, blocks)
+        return self
+
+    def _set_shared(self, specs, blocks):
+        for (attr, (_, shape, dtype)), shm in zip(specs.items(), blocks):
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            setattr(self, attr, array if attr == "indptr" else torch.from_numpy(array))
+        self._shm_specs = specs
+        self._shm_blocks = blocks
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the pickled temporal rows aren't mapped anymore
+        state["_temporal_mmap"] = None
+        if self._shm_specs is not None:
+            for attr in self._shm_specs:
+                state[attr] = None
+            state["_shm_blocks"] = None
+        return state
+
+    def __setstate__(self, state):
+        # datasets pickled by previous versions don't have the shared memory attributes
+        state.setdefault("_shm_specs", None)
+        state.setdefault("_shm_blocks", None)
+        state.setdefault("_temporal_mmap", None)
+        self.__dict__.update(state)
+        if self._shm_specs is not None:
+            blocks = [
+                _attach_shared_memory(name) for name, _, _ in self._shm_specs.values()
+            ]
+            self._set_shared(self._shm_specs, blocks)
+
+    def _as_torch(
         self,
         x: Union[np.ndarray, torch.Tensor],
         dtype: torch.dtype = torch.float32,
     ) -> torch.Tensor:
+        # Only copy when a cast is needed or the array is read-only,
+        # float32 and memory-mapped arrays are shared with the input.
         if isinstance(x, np.ndarray):
+            if not x.flags.writeable:
+                x = x.copy()
             x = torch.from_numpy(x)
-        return x.to(dtype, copy=False).clone()
+        return x.to(dtype, copy=False)
 
     def align(
         self, df: DataFrame, id_col: str, time_col: str, target_col: str
@@ -161,10 +496,12 @@ class TimeSeriesDataset(Dataset):
         df = ufp.copy_if_pandas(df, deep=False)
 
         # Add Nones to missing columns (without available_mask)
+        # zeros for the ones stored as integers, which can't hold missing values
         temporal_cols = self.temporal_cols.copy()
-        for col in temporal_cols:
+        temporal_dtypes = self.temporal_dtypes or ["float32"] * len(temporal_cols)
+        for col, dtype in zip(temporal_cols, temporal_dtypes):
             if col not in df.columns:
-                df = ufp.assign_columns(df, col, np.nan)
+                df = ufp.assign_columns(df, col, np.nan if "float" in dtype else 0)
             if col == "available_mask":
                 df = ufp.assign_columns(df, col, 1.0)
 
@@ -178,6 +515,7 @@ class TimeSeriesDataset(Dataset):
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
+            temporal_dtypes=dict(zip(temporal_cols, temporal_dtypes)),
         )
         return dataset
 
@@ -187,25 +525,29 @@ class TimeSeriesDataset(Dataset):
             raise ValueError(
                 "Cannot append `futr_dataset` with different number of groups."
             )
+        if self.temporal_dtypes != futr_dataset.temporal_dtypes:
+            raise ValueError(
+                "Cannot append `futr_dataset` with different temporal storage dtypes."
+            )
         # Define and fill new temporal with updated information
         len_temporal, col_temporal = self.temporal.shape
         len_futr = futr_dataset.temporal.shape[0]
-        new_temporal = torch.empty(size=(len_temporal + len_futr, col_temporal))
+        new_temporal = torch.empty(
+            size=(len_temporal + len_futr, col_temporal), dtype=self.temporal.dtype
+        )
         new_indptr = self.indptr + futr_dataset.indptr
         new_sizes = np.diff(new_indptr)
         new_min_size = np.min(new_sizes)
         new_max_size = np.max(new_sizes)
 
-        for i in range(self.n_groups):
-            curr_slice = slice(self.indptr[i], self.indptr[i + 1])
-            curr_size = curr_slice.stop - curr_slice.start
-            futr_slice = slice(futr_dataset.indptr[i], futr_dataset.indptr[i + 1])
-            new_temporal[new_indptr[i] : new_indptr[i] + curr_size] = self.temporal[
-                curr_slice
-            ]
-            new_temporal[new_indptr[i] + curr_size : new_indptr[i + 1]] = (
-                futr_dataset.temporal[futr_slice]
-            )
+        # Scatter current and future rows to their position in the new series
+        curr_sizes = np.diff(self.indptr)
+        curr_idxs = _ranges_idxs(new_indptr[:-1], curr_sizes)
+        futr_idxs = _ranges_idxs(
+            new_indptr[:-1] + curr_sizes, np.diff(futr_dataset.indptr)
+        )
+        new_temporal[torch.from_numpy(curr_idxs)] = self.temporal
+        new_temporal[torch.from_numpy(futr_idxs)] = futr_dataset.temporal
 
         # Define new dataset
         return TimeSeriesDataset(
@@ -218,6 +560,7 @@ class TimeSeriesDataset(Dataset):
             y_idx=self.y_idx,
             static_cols=self.static_cols,
             sorted=self.sorted,
+            temporal_dtypes=self.temporal_dtypes,
         )
 
     @staticmethod
@@ -242,20 +585,10 @@ class TimeSeriesDataset(Dataset):
             )
 
         # Define and fill new temporal with trimmed information
-        len_temporal, col_temporal = dataset.temporal.shape
-        total_trim = (left_trim + right_trim) * dataset.n_groups
-        new_temporal = torch.zeros(size=(len_temporal - total_trim, col_temporal))
-        new_indptr = [0]
-
-        acum = 0
-        for i in range(dataset.n_groups):
-            series_length = dataset.indptr[i + 1] - dataset.indptr[i]
-            new_length = series_length - left_trim - right_trim
-            new_temporal[acum : (acum + new_length), :] = dataset.temporal[
-                dataset.indptr[i] + left_trim : dataset.indptr[i + 1] - right_trim, :
-            ]
-            acum += new_length
-            new_indptr.append(acum)
+        new_sizes = np.diff(dataset.indptr) - left_trim - right_trim
+        new_indptr = np.append(0, np.cumsum(new_sizes)).astype(np.int32)
+        idxs = _ranges_idxs(dataset.indptr[:-1] + left_trim, new_sizes)
+        new_temporal = dataset.temporal[torch.from_numpy(idxs)]
 
         new_max_size = dataset.max_size - left_trim - right_trim
         new_min_size = dataset.min_size - left_trim - right_trim
@@ -264,17 +597,219 @@ class TimeSeriesDataset(Dataset):
         updated_dataset = TimeSeriesDataset(
             temporal=new_temporal,
             temporal_cols=dataset.temporal_cols.copy(),
-            indptr=np.array(new_indptr, dtype=np.int32),
+            indptr=new_indptr,
             max_size=new_max_size,
             min_size=new_min_size,
             y_idx=dataset.y_idx,
             static=dataset.static,
             static_cols=dataset.static_cols,
             sorted=dataset.sorted,
+            temporal_dtypes=dataset.temporal_dtypes,
         )
 
         return updated_dataset
 
+    def _writable_copy(self) -> "TimeSeriesDataset":
+        # Shallow copy whose temporal rows can be written inplace without changing these ones.
+        # Memory-mapped rows are mapped again copy-on-write, so only the written pages are copied
+        dataset = copy(self)
+        mmap = self._temporal_mmap
+        if (
+            mmap is not None
+            and mmap.filename is not None
+            and self.temporal.data_ptr() == mmap.ctypes.data
+        ):
+            dataset._temporal_mmap = np.memmap(
+                mmap.filename,
+                dtype=mmap.dtype,
+                mode="c",
+                offset=mmap.offset,
+                shape=mmap.shape,
+            )
+            dataset.temporal = torch.from_numpy(dataset._temporal_mmap)
+        else:
+            dataset.temporal = self.temporal.clone()
+        return dataset
+
+    def tail(self, n: int):
+        """
+        Keep the last `n` timestamps of each serie.
+        Returns the dataset itself if no serie is longer than `n`.
+        """
+        if self.max_size <= n:
+            return self
+        sizes = np.diff(self.indptr)
+        new_sizes = np.minimum(sizes, n)
+        new_indptr = np.append(0, np.cumsum(new_sizes)).astype(np.int32)
+        idxs = _ranges_idxs(self.indptr[1:] - new_sizes, new_sizes)
+        return TimeSeriesDataset(
+            temporal=self.temporal[torch.from_numpy(idxs)],
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=new_indptr,
+            max_size=n,
+            min_size=min(self.min_size, n),
+            y_idx=self.y_idx,
+            static=self.static,
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            temporal_dtypes=self.temporal_dtypes,
+        )
+
+    def select(self, idxs: np.ndarray) -> "TimeSeriesDataset":
+        """
+        Keep the series at positions `idxs`, in that order.
+        Returns a copy
+        """
+        idxs = np.asarray(idxs, dtype=np.int64)
+        sizes = np.diff(self.indptr)[idxs]
+        rows = _ranges_idxs(self.indptr[idxs], sizes)
+        static = self.static
+        if static is not None:
+            static = static[torch.from_numpy(idxs)]
+        return TimeSeriesDataset(
+            temporal=self.temporal[torch.from_numpy(rows)],
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=np.append(0, np.cumsum(sizes)).astype(np.int32),
+            max_size=sizes.max(),
+            min_size=sizes.min(),
+            y_idx=self.y_idx,
+            static=static,
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            temporal_dtypes=self.temporal_dtypes,
+        )
+
+    def save(self, path: str, uids=None, last_dates=None, ds=None) -> None:
+        """Save the dataset arrays as `.npy` files inside the `path` directory.
+
+        The stored dataset can be memory-mapped with `TimeSeriesDataset.load`.
+        Pass the `uids`, `last_dates` and `ds` returned by `from_df` to be able to
+        use the loaded dataset directly in `NeuralForecast.fit` and `NeuralForecast.predict`.
+        The identifiers are stored as an Arrow file when `pyarrow` is installed
+        and pickled otherwise.
+        """
+        fs, _, _ = fsspec.get_fs_token_paths(path)
+        fs.makedirs(path, exist_ok=True)
+
+        def _save_array(name, array):
+            with fsspec.open(f"{path}/{name}.npy", "wb") as f:
+                np.save(f, array)
+
+        _save_array("temporal", self.temporal.numpy())
+        _save_array("indptr", self.indptr)
+        if self.static is not None:
+            _save_array("static", self.static.numpy())
+        metadata = dict(
+            format_version=TimeSeriesDataset.FORMAT_VERSION,
+            temporal_cols=self.temporal_cols.tolist(),
+            static_cols=None if self.static_cols is None else list(self.static_cols),
+            max_size=int(self.max_size),
+            min_size=int(self.min_size),
+            y_idx=int(self.y_idx),
+            sorted=bool(self.sorted),
+            temporal_dtypes=self.temporal_dtypes,
+            ids_format=None,
+        )
+        if uids is not None:
+            try:
+                import pyarrow as pa
+
+                metadata["ids_format"] = "arrow"
+            except ImportError:
+                metadata["ids_format"] = "pickle"
+            if metadata["ids_format"] == "arrow":
+                metadata["ids_types"] = [_column_type(uids), _column_type(last_dates)]
+                metadata["ids_names"] = [uids.name, last_dates.name]
+                table = pa.table(
+                    {
+                        "uids": _column_to_arrow(uids),
+                        "last_dates": _column_to_arrow(last_dates),
+                    }
+                )
+                with fsspec.open(f"{path}/ids.arrow", "wb") as f:
+                    with pa.ipc.new_file(f, table.schema) as writer:
+                        writer.write_table(table)
+            else:
+                with fsspec.open(f"{path}/ids.pkl", "wb") as f:
+                    pickle.dump(dict(uids=uids, last_dates=last_dates), f)
+            _save_array("ds", ds)
+        # metadata is written last, a directory without it is an incomplete save
+        with fsspec.open(f"{path}/metadata.json", "w") as f:
+            json.dump(metadata, f)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "TimeSeriesDataset":
+        """Load a dataset stored with `TimeSeriesDataset.save`.
+
+        When `mmap=True` the arrays are memory-mapped (copy-on-write) instead of read,
+        so only the rows of the accessed series are brought into memory and several
+        processes share the same on-disk copy. Memory mapping is only available for
+        local paths, datasets in remote filesystems are always read.
+        """
+        fs, _, _ = fsspec.get_fs_token_paths(path)
+        mmap = mmap and isinstance(fs, LocalFileSystem)
+
+        def _load_array(name):
+            if mmap:
+                return np.load(f"{path}/{name}.npy", mmap_mode="c")
+            with fsspec.open(f"{path}/{name}.npy", "rb") as f:
+                return np.load(f)
+
+        with fsspec.open(f"{path}/metadata.json", "r") as f:
+            metadata = json.load(f)
+        if metadata.get("format_version", 1) > TimeSeriesDataset.FORMAT_VERSION:
+            raise ValueError(
+                f"The dataset in {path} was saved with a newer format version "
+                f"({metadata['format_version']}), please upgrade neuralforecast."
+            )
+        if metadata["static_cols"] is not None:
+            static = _load_array("static")
+            static_cols = pd.Index(metadata["static_cols"])
+        else:
+            static = None
+            static_cols = None
+        temporal = _load_array("temporal")
+        dataset = TimeSeriesDataset(
+            temporal=temporal,
+            temporal_cols=metadata["temporal_cols"],
+            indptr=_load_array("indptr"),
+            max_size=metadata["max_size"],
+            min_size=metadata["min_size"],
+            y_idx=metadata["y_idx"],
+            static=static,
+            static_cols=static_cols,
+            sorted=metadata["sorted"],
+            temporal_dtypes=metadata.get("temporal_dtypes"),
+        )
+        if mmap:
+            dataset._temporal_mmap = temporal
+        # datasets saved before the format version only had pickled ids
+        ids_format = metadata.get(
+            "ids_format", "pickle" if fs.exists(f"{path}/ids.pkl") else None
+        )
+        if ids_format == "arrow":
+            import pyarrow as pa
+
+            if mmap:
+                table = pa.ipc.open_file(pa.memory_map(f"{path}/ids.arrow")).read_all()
+            else:
+                with fsspec.open(f"{path}/ids.arrow", "rb") as f:
+                    table = pa.ipc.open_file(f).read_all()
+            dataset.uids, dataset.last_dates = (
+                _column_from_arrow(table.column(col), col_type, name)
+                for col, col_type, name in zip(
+                    ["uids", "last_dates"], metadata["ids_types"], metadata["ids_names"]
+                )
+            )
+        elif ids_format == "pickle":
+            with fsspec.open(f"{path}/ids.pkl", "rb") as f:
+                ids = pickle.load(f)
+            dataset.uids = ids["uids"]
+            dataset.last_dates = ids["last_dates"]
+        if ids_format is not None:
+            dataset.ds = _load_array("ds")
+        return dataset
+
     @staticmethod
     def from_df(
         df,
@@ -283,6 +818,8 @@ class TimeSeriesDataset(Dataset):
         id_col="unique_id",
         time_col="ds",
         target_col="y",
+        exog_cols=None,
+        temporal_dtypes=None,
     ):
         # TODO: protect on equality of static_df + df indexes
         if isinstance(df, pd.DataFrame) and df.index.name == id_col:
@@ -301,16 +838,57 @@ class TimeSeriesDataset(Dataset):
             if sort_df:
                 static_df = ufp.sort(static_df, by=id_col)
 
-        ids, times, data, indptr, sort_idxs = ufp.process_df(
-            df, id_col, time_col, target_col
-        )
-        # processor sets y as the first column
+        validate_format(df, id_col, time_col, target_col)
+        id_counts = ufp.counts_by_id(df, id_col)
+        indices = id_counts[id_col]
+        indptr = np.append(0, id_counts["counts"].to_numpy().cumsum()).astype(np.int32)
+        sort_idxs = ufp.maybe_compute_sort_indices(df, id_col, time_col)
+        last_idxs = indptr[1:] - 1
+        if sort_idxs is not None:
+            last_idxs = sort_idxs[last_idxs]
+        times = df[time_col].to_numpy()[last_idxs]
+
+        # y first, then the exogenous columns, keeping only `exog_cols` if provided
         temporal_cols = pd.Index(
             [target_col]
-            + [c for c in df.columns if c not in (id_col, time_col, target_col)]
+            + [
+                c
+                for c in df.columns
+                if c not in (id_col, time_col, target_col)
+                and (exog_cols is None or c in exog_cols or c == "available_mask")
+            ]
         )
-        temporal = data.astype(np.float32, copy=False)
-        indices = ids
+        has_mask = "available_mask" in temporal_cols
+        if not has_mask:
+            temporal_cols = temporal_cols.append(pd.Index(["available_mask"]))
+
+        # Write every column straight into the final buffer, packed
+        # with the storage dtype of each column if any isn't float32
+        if temporal_dtypes is not None:
+            temporal_dtypes = [
+                temporal_dtypes.get(col, "float32") for col in temporal_cols
+            ]
+        if temporal_dtypes is not None and any(
+            dtype != "float32" for dtype in temporal_dtypes
+        ):
+            layout = _TemporalLayout(temporal_dtypes)
+            temporal = layout.empty(df.shape[0])
+        else:
+            layout = None
+            temporal = np.empty((df.shape[0], len(temporal_cols)), dtype=np.float32)
+        for i, col in enumerate(temporal_cols):
+            if col == "available_mask" and not has_mask:
+                values = np.ones(df.shape[0], dtype=np.float32)
+            else:
+                values = _column_to_numpy(df[col])
+                if sort_idxs is not None:
+                    values = values[sort_idxs]
+            if layout is None:
+                temporal[:, i] = values
+            else:
+                layout.set_column(
+                    temporal, i, torch.from_numpy(np.asarray(values, dtype=np.float32))
+                )
         if isinstance(df, pd.DataFrame):
             dates = pd.Index(times, name=time_col)
         else:
@@ -319,12 +897,6 @@ class TimeSeriesDataset(Dataset):
         max_size = max(sizes)
         min_size = min(sizes)
 
-        # Add Available mask efficiently (without adding column to df)
-        if "available_mask" not in df.columns:
-            available_mask = np.ones((len(temporal), 1), dtype=np.float32)
-            temporal = np.append(temporal, available_mask, axis=1)
-            temporal_cols = temporal_cols.append(pd.Index(["available_mask"]))
-
         # Static features
         if static_df is not None:
             static_cols = [col for col in static_df.columns if col != id_col]
@@ -344,13 +916,349 @@ class TimeSeriesDataset(Dataset):
             min_size=min_size,
             sorted=sort_df,
             y_idx=0,
+            temporal_dtypes=temporal_dtypes,
         )
         ds = df[time_col].to_numpy()
         if sort_idxs is not None:
             ds = ds[sort_idxs]
         return dataset, indices, dates, ds
 
-# %% ../nbs/tsdataset.ipynb 10
+# %% ../nbs/tsdataset.ipynb 15
+class _WindowsDataset(Dataset):
+    """Window-level view of a `TimeSeriesDataset`.
+
+    Enumerates the valid `(series, start)` pairs of the training windows once,
+    from `indptr` and the `available_mask` column, and gathers the sampled
+    `input_size + h` slices straight from the CSR `temporal` buffer.
+    Produces the same windows as unfolding the left-padded series in
+    `BaseWindows._create_windows`, without materializing the padding.
+    """
+
+    def __init__(
+        self,
+        dataset: TimeSeriesDataset,
+        input_size: int,
+        h: int,
+        step_size: int = 1,
+        cutoff: int = 0,
+        start_padding_enabled: bool = False,
+    ):
+        self.dataset = dataset
+        self.input_size = input_size
+        self.h = h
+        self.window_size = input_size + h
+
+        sizes = np.diff(dataset.indptr).astype(np.int64)
+        self.sizes = np.maximum(sizes - cutoff, 0)
+        left_pad = input_size - 1 if start_padding_enabled else 0
+        padded_size = left_pad + dataset.max_size - cutoff + h
+        if padded_size < self.window_size:
+            raise Exception(
+                "Time series is too short for training, consider setting a smaller input size or set start_padding_enabled=True"
+            )
+
+        # Candidate starts on the unfold grid of the padded series whose
+        # insample and outsample parts overlap the series
+        offsets = left_pad + dataset.max_size - sizes
+        lo = np.maximum(offsets - input_size + 1, 0)
+        hi = offsets + self.sizes - 1 - (input_size if h > 0 else 0)
+        hi = np.minimum(hi, padded_size - self.window_size)
+        k_lo = -(-lo // step_size)
+        counts = np.maximum(hi // step_size - k_lo + 1, 0)
+        series = np.repeat(np.arange(dataset.n_groups), counts)
+        starts = _ranges_idxs(k_lo, counts) * step_size - offsets[series]
+
+        # Keep windows with available insample and outsample values
+        mask = dataset._temporal_column(dataset.temporal_cols.get_loc("available_mask"))
+        mask_cumsum = np.append(0, np.cumsum(mask.numpy(), dtype=np.float64))
+        condition = self._mask_sum(mask_cumsum, series, starts, starts + input_size) > 0
+        if h > 0:
+            outsample_sum = self._mask_sum(
+                mask_cumsum, series, starts + input_size, starts + self.window_size
+            )
+            condition &= outsample_sum > 0
+        self.series = series[condition]
+        self.starts = starts[condition]
+        if len(self.series) == 0:
+            raise Exception("No windows available for training")
+
+    def _mask_sum(self, mask_cumsum, series, start, end):
+        base = self.dataset.indptr[series]
+        sizes = self.sizes[series]
+        start = base + np.clip(start, 0, sizes)
+        end = base + np.clip(end, 0, sizes)
+        return mask_cumsum[end] - mask_cumsum[start]
+
+    def __len__(self):
+        return len(self.series)
+
+    def __getitems__(self, idxs):
+        idxs = np.asarray(idxs)
+        series = self.series[idxs]
+        sizes = self.sizes[series]
+        # [B, L+H] positions relative to the start of each series
+        rows = self.starts[idxs, None] + np.arange(self.window_size)
+        valid = (rows >= 0) & (rows < sizes[:, None])
+        rows = self.dataset.indptr[series, None] + np.clip(
+            rows, 0, np.maximum(sizes[:, None] - 1, 0)
+        )
+        temporal = self.dataset._take_rows(torch.from_numpy(rows.reshape(-1))).view(
+            *rows.shape, -1
+        )
+        temporal[torch.from_numpy(~valid)] = 0.0
+
+        static = self.dataset.static
+        if static is not None:
+            static = static[torch.from_numpy(series)]
+        return dict(
+            temporal=temporal,
+            temporal_cols=self.dataset.temporal_cols,
+            static=static,
+            static_cols=self.dataset.static_cols,
+            y_idx=self.dataset.y_idx,
+        )
+
+    def __getitem__(self, idx):
+        return self.__getitems__([idx])
+
+# %% ../nbs/tsdataset.ipynb 16
+class _LengthBucketBatchSampler(Sampler):
+    """Batches of series with similar lengths.
+
+    Every epoch the series are shuffled and split into pools of
+    `batch_size * bucket_size_multiplier`, each pool is sorted by length and
+    cut into batches, and the order of the batches is shuffled again.
+    Keeps track of the padding of the epoch's batches when padded to their
+    longest series instead of the dataset's `max_size`.
+    """
+
+    def __init__(self, sizes, batch_size, drop_last=False, bucket_size_multiplier=50):
+        self.sizes = np.asarray(sizes)
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+        self.bucket_size_multiplier = bucket_size_multiplier
+        self.padding_ratio = None
+        self.padding_ratio_saved = None
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.sizes) // self.batch_size
+        return -(-len(self.sizes) // self.batch_size)
+
+    def __iter__(self):
+        idxs = torch.randperm(len(self.sizes)).numpy()
+        if self.drop_last:
+            idxs = idxs[: len(self) * self.batch_size]
+        pool_size = self.batch_size * self.bucket_size_multiplier
+        batches = []
+        for start in range(0, len(idxs), pool_size):
+            pool = idxs[start : start + pool_size]
+            pool = pool[np.argsort(self.sizes[pool], kind="stable")]
+            batches.extend(
+                pool[i : i + self.batch_size]
+                for i in range(0, len(pool), self.batch_size)
+            )
+        batches = [batches[i] for i in torch.randperm(len(batches)).tolist()]
+        self._update_padding_stats(batches)
+        for batch in batches:
+            yield batch.tolist()
+
+    def _update_padding_stats(self, batches):
+        data_size = sum(self.sizes[batch].sum() for batch in batches)
+        bucketed_size = sum(len(batch) * self.sizes[batch].max() for batch in batches)
+        padded_size = sum(len(batch) for batch in batches) * self.sizes.max()
+        self.padding_ratio = float(1 - data_size / bucketed_size)
+        self.padding_ratio_saved = float(1 - bucketed_size / padded_size)
+
+# %% ../nbs/tsdataset.ipynb 17
+class _BatchedDataset(Dataset):
+    """Batch-level view of a `TimeSeriesDataset`.
+
+    Batches are left-padded to their longest series when `pad_to_batch_max`,
+    otherwise to the dataset's `max_size`, and gathered into `buffers` if provided.
+    """
+
+    def __init__(
+        self, dataset: TimeSeriesDataset, pad_to_batch_max=False, buffers=None
+    ):
+        self.dataset = dataset
+        self.pad_to_batch_max = pad_to_batch_max
+        self.buffers = buffers
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitems__(self, idxs):
+        size = None
+        if self.pad_to_batch_max:
+            idxs = np.asarray(idxs)
+            size = np.max(self.dataset.indptr[idxs + 1] - self.dataset.indptr[idxs])
+        return self.dataset._gather(idxs, size=size, buffers=self.buffers)
+
+    def __getitem__(self, idx):
+        return self.__getitems__([idx])
+
+# %% ../nbs/tsdataset.ipynb 18
+class _SeriesBuffer:
+    """Temporal rows of each serie of a `TimeSeriesDataset`, extended with `append`.
+
+    Rows are kept with the storage layout of the dataset, so appending new rows only
+    writes them.
+    """
+
+    def __init__(self, dataset: TimeSeriesDataset):
+        self.temporal_cols = dataset.temporal_cols.copy()
+        self.temporal_dtypes = dataset.temporal_dtypes
+        self.static = dataset.static
+        self.static_cols = dataset.static_cols
+        self.y_idx = dataset.y_idx
+        self.sorted = dataset.sorted
+        self.sizes = np.diff(dataset.indptr).astype(np.int64)
+
+    def _gather(self, groups: np.ndarray) -> torch.Tensor:
+        # Rows of the series `groups`, concatenated
+        raise NotImplementedError
+
+    def append(
+        self, groups: np.ndarray, temporal: torch.Tensor, indptr: np.ndarray
+    ) -> None:
+        """Write the rows `temporal[indptr[i]:indptr[i + 1]]` after the last ones of serie `groups[i]`."""
+        raise NotImplementedError
+
+    def to_dataset(self, groups: Optional[np.ndarray] = None) -> TimeSeriesDataset:
+        """`TimeSeriesDataset` with the rows in the buffer of the series `groups`, all of them if None."""
+        static = self.static
+        if groups is None:
+            groups = np.arange(self.sizes.size)
+        elif static is not None:
+            static = static[torch.from_numpy(groups)]
+        sizes = self.sizes[groups]
+        return TimeSeriesDataset(
+            temporal=self._gather(groups),
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=np.append(0, np.cumsum(sizes)).astype(np.int32),
+            max_size=sizes.max(),
+            min_size=sizes.min(),
+            y_idx=self.y_idx,
+            static=static,
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            temporal_dtypes=self.temporal_dtypes,
+        )
+
+
+class _TailBuffer(_SeriesBuffer):
+    """Ring buffer with the last `capacity` temporal rows of each serie of a `TimeSeriesDataset`."""
+
+    def __init__(self, dataset: TimeSeriesDataset, capacity: int):
+        super().__init__(dataset)
+        self.sizes = np.minimum(self.sizes, capacity)
+        # Position of the next row of each serie in its ring
+        self.ends = self.sizes % capacity
+        self.rows = dataset.temporal.new_zeros(
+            (dataset.n_groups, capacity, dataset.temporal.shape[1])
+        )
+        series, steps = self._positions(np.zeros_like(self.sizes), self.sizes)
+        rows = _ranges_idxs(dataset.indptr[1:] - self.sizes, self.sizes)
+        self.rows[series, steps] = dataset.temporal[torch.from_numpy(rows)]
+
+    @property
+    def capacity(self) -> int:
+        return self.rows.shape[1]
+
+    def _positions(self, starts, sizes, groups=None):
+        # Series and ring positions of `sizes` consecutive rows from `starts` of each serie
+        if groups is None:
+            groups = np.arange(sizes.size)
+        series = np.repeat(groups, sizes)
+        steps = np.repeat(starts, sizes) + _ranges_idxs(np.zeros_like(sizes), sizes)
+        return torch.from_numpy(series), torch.from_numpy(steps % self.capacity)
+
+    def _gather(self, groups: np.ndarray) -> torch.Tensor:
+        sizes = self.sizes[groups]
+        series, steps = self._positions(self.ends[groups] - sizes, sizes, groups=groups)
+        return self.rows[series, steps]
+
+    def append(
+        self, groups: np.ndarray, temporal: torch.Tensor, indptr: np.ndarray
+    ) -> None:
+        counts = np.diff(indptr)
+        # Only the last `capacity` new rows of each serie are kept
+        kept = np.minimum(counts, self.capacity)
+        series, steps = self._positions(
+            self.ends[groups] + counts - kept, kept, groups=groups
+        )
+        rows = _ranges_idxs(indptr[1:] - kept, kept)
+        self.rows[series, steps] = temporal[torch.from_numpy(rows)]
+        self.ends[groups] = (self.ends[groups] + counts) % self.capacity
+        self.sizes[groups] = np.minimum(self.sizes[groups] + counts, self.capacity)
+
+
+class _HistoryBuffer(_SeriesBuffer):
+    """Every temporal row of each serie of a `TimeSeriesDataset`, in CSR layout.
+
+    The series are read from the rows of the dataset until they get new rows, then
+    each one is moved to a block of `rows` with room to grow, which is moved again
+    to a block twice as large when it fills up. `rows` is compacted when it's full.
+    """
+
+    def __init__(self, dataset: TimeSeriesDataset):
+        super().__init__(dataset)
+        self.base = dataset.temporal
+        self.starts = dataset.indptr[:-1].astype(np.int64)
+        self.capacities = self.sizes.copy()
+        # Whether each serie was moved from the rows of the dataset to `rows`
+        self.moved = np.zeros(self.sizes.size, dtype=bool)
+        self.rows = self.base.new_zeros((0, self.base.shape[1]))
+        self.n_rows = 0
+
+    def _gather(self, groups: np.ndarray) -> torch.Tensor:
+        sizes = self.sizes[groups]
+        starts = self.starts[groups]
+        moved = self.moved[groups]
+        out = self.base.new_empty((sizes.sum(), self.base.shape[1]))
+        offsets = np.cumsum(sizes) - sizes
+        for mask, source in ((~moved, self.base), (moved, self.rows)):
+            idxs = _ranges_idxs(offsets[mask], sizes[mask])
+            rows = _ranges_idxs(starts[mask], sizes[mask])
+            out[torch.from_numpy(idxs)] = source[torch.from_numpy(rows)]
+        return out
+
+    def _move(self, groups: np.ndarray, capacities: np.ndarray) -> None:
+        # Copy the series `groups` to new blocks of `capacities` rows at the end of `rows`
+        rows = self.rows
+        start = self.n_rows
+        if start + capacities.sum() > len(rows):
+            # Compact the series already moved into new rows with room for as many
+            others = np.setdiff1d(np.flatnonzero(self.moved), groups)
+            groups = np.append(others, groups)
+            capacities = np.append(self.capacities[others], capacities)
+            rows = rows.new_zeros((2 * capacities.sum(), rows.shape[1]))
+            start = 0
+        starts = start + np.cumsum(capacities) - capacities
+        sizes = self.sizes[groups]
+        rows[torch.from_numpy(_ranges_idxs(starts, sizes))] = self._gather(groups)
+        self.rows = rows
+        self.n_rows = start + capacities.sum()
+        self.starts[groups] = starts
+        self.capacities[groups] = capacities
+        self.moved[groups] = True
+
+    def append(
+        self, groups: np.ndarray, temporal: torch.Tensor, indptr: np.ndarray
+    ) -> None:
+        counts = np.diff(indptr)
+        sizes = self.sizes[groups] + counts
+        full = (counts > 0) & (sizes > self.capacities[groups])
+        if full.any():
+            self._move(groups[full], 2 * sizes[full])
+        rows = _ranges_idxs(self.starts[groups] + self.sizes[groups], counts)
+        self.rows[torch.from_numpy(rows)] = temporal[
+            torch.from_numpy(_ranges_idxs(indptr[:-1], counts))
+        ]
+        self.sizes[groups] = sizes
+
+# %% ../nbs/tsdataset.ipynb 20
 class _FilesDataset:
     def __init__(
         self,
@@ -370,7 +1278,221 @@ class _FilesDataset:
         self.target_col = target_col
         self.min_size = min_size
 
-# %% ../nbs/tsdataset.ipynb 11
+# %% ../nbs/tsdataset.ipynb 21
+class ParquetTimeSeriesDataset(IterableDataset):
+    """Streaming dataset over a directory of Parquet files.
+
+    Reads the series of a panel that doesn't fit in memory from local Parquet files
+    without loading them all. The files are read row group by row group, projecting
+    only the needed columns, and the series go through an in-memory shuffle buffer
+    before being batched. Every series has to be contained in a single file sorted by time,
+    like the ones written by `df.sort_values([id_col, time_col]).to_parquet(path)` per chunk
+    of series or by `df.to_parquet(path, partition_cols=[id_col])`.
+
+    **Parameters:**<br>
+    `path`: str, directory with the Parquet files.<br>
+    `id_col`: str='unique_id', column that identifies each serie.<br>
+    `time_col`: str='ds', column that identifies each timestep.<br>
+    `target_col`: str='y', column that contains the target.<br>
+    `exog_cols`: list of str, optional, temporal exogenous columns to read, all the remaining ones by default.<br>
+    `static_cols`: list of str, optional, columns with the static exogenous, constant within each serie.<br>
+    `shuffle_buffer_size`: int=1024, number of series kept in memory to shuffle them.<br>
+    """
+
+    def __init__(
+        self,
+        path: str,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        exog_cols: Optional[List[str]] = None,
+        static_cols: Optional[List[str]] = None,
+        shuffle_buffer_size: int = 1024,
+    ):
+        import pyarrow.dataset as pads
+
+        self.path = path
+        self.id_col = id_col
+        self.time_col = time_col
+        self.target_col = target_col
+        self.shuffle_buffer_size = shuffle_buffer_size
+        arrow_ds = pads.dataset(path, format="parquet", partitioning="hive")
+        names = arrow_ds.schema.names
+        static_cols = [] if static_cols is None else list(static_cols)
+        if exog_cols is None:
+            exog_cols = [
+                c
+                for c in names
+                if c
+                not in [id_col, time_col, target_col, "available_mask"] + static_cols
+            ]
+        temporal_cols = [target_col] + list(exog_cols)
+        self.has_mask = "available_mask" in names
+        self.temporal_cols = pd.Index(temporal_cols + ["available_mask"])
+        self.static_cols = pd.Index(static_cols) if static_cols else None
+        self.y_idx = 0
+
+        # Units of work: all the files of an id partition, or a single file
+        units: Dict[str, list] = {}
+        for fragment in arrow_ds.get_fragments():
+            key = pads.get_partition_keys(fragment.partition_expression).get(id_col)
+            units.setdefault(fragment.path if key is None else key, []).append(fragment)
+        self.units = list(units.values())
+
+        # Sizes are read from the metadata or the id column only
+        sizes_list: List[int] = []
+        for fragments in self.units:
+            if id_col not in fragments[0].physical_schema.names:
+                sizes_list.append(sum(fragment.count_rows() for fragment in fragments))
+                continue
+            ids = (
+                fragments[0]
+                .to_table(columns=[id_col])
+                .column(0)
+                .to_numpy(zero_copy_only=False)
+            )
+            starts = np.append(0, np.flatnonzero(ids[1:] != ids[:-1]) + 1)
+            sizes_list.extend(np.diff(np.append(starts, len(ids))))
+        sizes = np.asarray(sizes_list)
+        self.n_groups = len(sizes)
+        self.max_size = sizes.max()
+        self.min_size = sizes.min()
+
+        # Set by the loaders
+        self.batch_size = 32
+        self.shuffle = False
+        self.drop_last = False
+
+    def __repr__(self):
+        return f"ParquetTimeSeriesDataset(path={self.path}, n_groups={self.n_groups:,})"
+
+    def _with_batches(self, batch_size, shuffle=False, drop_last=False):
+        batches = copy(self)
+        batches.batch_size = batch_size
+        batches.shuffle = shuffle
+        batches.drop_last = drop_last
+        return batches
+
+    def _read_columns(self, fragment):
+        names = fragment.physical_schema.names
+        columns = [c for c in self.temporal_cols if c in names]
+        columns += [c for c in [self.id_col, self.time_col] if c in names]
+        if self.static_cols is not None:
+            columns += list(self.static_cols)
+        return columns
+
+    def _to_series(self, table, single_serie=False):
+        # [n, C] float32 temporal and [S] static values of each serie in the table
+        n_rows = table.num_rows
+        starts = np.array([0])
+        if not single_serie:
+            ids = table.column(self.id_col).to_numpy(zero_copy_only=False)
+            starts = np.append(0, np.flatnonzero(ids[1:] != ids[:-1]) + 1)
+        temporal = np.empty((n_rows, len(self.temporal_cols)), dtype=np.float32)
+        for i, col in enumerate(self.temporal_cols):
+            if col == "available_mask" and not self.has_mask:
+                temporal[:, i] = 1.0
+            else:
+                temporal[:, i] = table.column(col).to_numpy(zero_copy_only=False)
+        static = None
+        if self.static_cols is not None:
+            static = np.stack(
+                [
+                    table.column(col).take(starts).to_numpy(zero_copy_only=False)
+                    for col in self.static_cols
+                ],
+                axis=1,
+            ).astype(np.float32)
+        ends = np.append(starts[1:], n_rows)
+        return [
+            (temporal[start:end], None if static is None else static[i])
+            for i, (start, end) in enumerate(zip(starts, ends))
+        ]
+
+    def _iter_series(self, units):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        for fragments in units:
+            if self.id_col not in fragments[0].physical_schema.names:
+                # Hive partition with a single serie, possibly split in several files
+                table = pa.concat_tables(
+                    fragment.to_table(columns=self._read_columns(fragment))
+                    for fragment in fragments
+                )
+                table = table.sort_by(self.time_col)
+                yield from self._to_series(table, single_serie=True)
+                continue
+            # Read row group by row group, the last serie may continue in the next one
+            fragment = fragments[0]
+            pending = None
+            for record_batch in fragment.to_batches(
+                columns=self._read_columns(fragment)
+            ):
+                table = pa.Table.from_batches([record_batch])
+                if pending is not None:
+                    table = pa.concat_tables([pending, table])
+                if table.num_rows == 0:
+                    continue
+                ids = table.column(self.id_col)
+                n_complete = table.num_rows - pc.sum(pc.equal(ids, ids[-1])).as_py()
+                if n_complete > 0:
+                    yield from self._to_series(table.slice(0, n_complete))
+                pending = table.slice(n_complete)
+            if pending is not None and pending.num_rows > 0:
+                yield from self._to_series(pending)
+
+    def _shuffled(self, series):
+        buffer = []
+        for item in series:
+            buffer.append(item)
+            if len(buffer) >= self.shuffle_buffer_size:
+                i = torch.randint(len(buffer), size=()).item()
+                buffer[i], buffer[-1] = buffer[-1], buffer[i]
+                yield buffer.pop()
+        for i in torch.randperm(len(buffer)).tolist():
+            yield buffer[i]
+
+    def _collate(self, items):
+        sizes = [len(temporal) for temporal, _ in items]
+        dataset = TimeSeriesDataset(
+            temporal=np.concatenate([temporal for temporal, _ in items]),
+            temporal_cols=self.temporal_cols,
+            indptr=np.append(0, np.cumsum(sizes)),
+            max_size=self.max_size,
+            min_size=min(sizes),
+            static=(
+                None
+                if self.static_cols is None
+                else np.stack([static for _, static in items])
+            ),
+            static_cols=self.static_cols,
+            y_idx=self.y_idx,
+        )
+        return dataset._gather(np.arange(len(items)))
+
+    def __iter__(self):
+        # Split the files across the loader's workers, then shuffle each worker's share
+        units = self.units
+        worker_info = torch.utils.data.get_worker_info()
+        if worker_info is not None:
+            units = units[worker_info.id :: worker_info.num_workers]
+        if self.shuffle:
+            units = [units[i] for i in torch.randperm(len(units)).tolist()]
+            series = self._shuffled(self._iter_series(units))
+        else:
+            series = self._iter_series(units)
+
+        items = []
+        for item in series:
+            items.append(item)
+            if len(items) == self.batch_size:
+                yield self._collate(items)
+                items = []
+        if items and not self.drop_last:
+            yield self._collate(items)
+
+# %% ../nbs/tsdataset.ipynb 23
 class TimeSeriesDataModule(pl.LightningDataModule):
 
     def __init__(
@@ -381,6 +1503,9 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         num_workers=0,
         drop_last=False,
         shuffle_train=True,
+        windows_kwargs=None,
+        bucket_by_length=False,
+        pin_memory=False,
     ):
         super().__init__()
         self.dataset = dataset
@@ -389,37 +1514,102 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         self.num_workers = num_workers
         self.drop_last = drop_last
         self.shuffle_train = shuffle_train
+        self.windows_kwargs = windows_kwargs
+        self.bucket_by_length = bucket_by_length
+        self.pin_memory = pin_memory
+
+    def _batched_dataset(self, dataset, pad_to_batch_max=False):
+        # Without workers, gather the batches straight into reusable pinned
+        # buffers. Workers send their batches through shared memory instead.
+        buffers = None
+        if self.pin_memory and self.num_workers == 0:
+            buffers = _BatchBuffers(pin_memory=True)
+        return _BatchedDataset(
+            dataset, pad_to_batch_max=pad_to_batch_max, buffers=buffers
+        )
+
+    def _streaming_loader(self, batch_size, shuffle=False, drop_last=False):
+        # The dataset yields whole batches read from disk
+        return TimeSeriesLoader(
+            self.dataset._with_batches(
+                batch_size, shuffle=shuffle, drop_last=drop_last
+            ),
+            batch_size=None,
+            num_workers=self.num_workers,
+            pin_memory=self.pin_memory,
+        )
 
     def train_dataloader(self):
+        if isinstance(self.dataset, ParquetTimeSeriesDataset):
+            if self.windows_kwargs is not None or self.bucket_by_length:
+                raise ValueError(
+                    "Streaming datasets only support sampling series, without length buckets."
+                )
+            return self._streaming_loader(
+                self.batch_size, shuffle=self.shuffle_train, drop_last=self.drop_last
+            )
+        pin_memory = self.pin_memory and self.num_workers > 0
+        if self.windows_kwargs is not None:
+            # Sample training windows instead of series
+            return TimeSeriesLoader(
+                _WindowsDataset(self.dataset, **self.windows_kwargs),
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                shuffle=self.shuffle_train,
+                drop_last=self.drop_last,
+                pin_memory=self.pin_memory,
+            )
+        if self.bucket_by_length:
+            # Batch series of similar lengths and pad them to the batch's longest
+            batch_sampler = _LengthBucketBatchSampler(
+                sizes=np.diff(self.dataset.indptr),
+                batch_size=self.batch_size,
+                drop_last=self.drop_last,
+            )
+            return TimeSeriesLoader(
+                self._batched_dataset(self.dataset, pad_to_batch_max=True),
+                batch_sampler=batch_sampler,
+                num_workers=self.num_workers,
+                pin_memory=pin_memory,
+            )
         loader = TimeSeriesLoader(
-            self.dataset,
+            self._batched_dataset(self.dataset),
             batch_size=self.batch_size,
             num_workers=self.num_workers,
             shuffle=self.shuffle_train,
             drop_last=self.drop_last,
+            pin_memory=pin_memory,
         )
         return loader
 
     def val_dataloader(self):
+        if isinstance(self.dataset, ParquetTimeSeriesDataset):
+            return self._streaming_loader(
+                self.valid_batch_size, drop_last=self.drop_last
+            )
         loader = TimeSeriesLoader(
-            self.dataset,
+            self._batched_dataset(self.dataset),
             batch_size=self.valid_batch_size,
             num_workers=self.num_workers,
             shuffle=False,
             drop_last=self.drop_last,
+            pin_memory=self.pin_memory and self.num_workers > 0,
         )
         return loader
 
     def predict_dataloader(self):
+        if isinstance(self.dataset, ParquetTimeSeriesDataset):
+            return self._streaming_loader(self.valid_batch_size)
         loader = TimeSeriesLoader(
-            self.dataset,
+            self._batched_dataset(self.dataset),
             batch_size=self.valid_batch_size,
             num_workers=self.num_workers,
             shuffle=False,
+            pin_memory=self.pin_memory and self.num_workers > 0,
         )
         return loader
 
-# %% ../nbs/tsdataset.ipynb 25
+# %% ../nbs/tsdataset.ipynb 48
 class _DistributedTimeSeriesDataModule(TimeSeriesDataModule):
     def __init__(
         self,
@@ -429,6 +1619,9 @@ class _DistributedTimeSeriesDataModule(TimeSeriesDataModule):
         num_workers=0,
         drop_last=False,
         shuffle_train=True,
+        windows_kwargs=None,
+        bucket_by_length=False,
+        pin_memory=False,
     ):
         super(TimeSeriesDataModule, self).__init__()
         self.files_ds = dataset
@@ -437,6 +1630,9 @@ class _DistributedTimeSeriesDataModule(TimeSeriesDataModule):
         self.num_workers = num_workers
         self.drop_last = drop_last
         self.shuffle_train = shuffle_train
+        self.windows_kwargs = windows_kwargs
+        self.bucket_by_length = bucket_by_length
+        self.pin_memory = pin_memory
 
     def setup(self, stage):
         import torch.distributed as dist